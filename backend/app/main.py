@@ -2,7 +2,7 @@ import uuid
 import time
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from .services.rate_limit_service import rate_limit_service
+from .services.rate_limit_service import Reservation, rate_limit_service
 from .models import Message as MessageModel
 from .models import Conversation
 from .database import get_db
@@ -33,6 +33,8 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+import orjson
+
 # Load environment variables from .env files
 try:
     from dotenv import load_dotenv  # type: ignore[import-not-found]
@@ -318,6 +320,24 @@ async def startup_validation():
         logging.warning(f"Failed to load knowledge base: {exc}")
 
 
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close the pooled outbound HTTP client."""
+    from .services._http import close_http_client
+
+    await close_http_client()
+
+
+@app.on_event("shutdown")
+async def stop_whisper_worker():
+    """Let the Whisper worker process finish queued jobs and exit."""
+    from starlette.concurrency import run_in_threadpool
+
+    from .services.whisper_service import whisper_service
+
+    await run_in_threadpool(whisper_service.close)
+
+
 # Configure CORS for cross-origin requests
 app.add_middleware(
     CORSMiddleware,
@@ -489,8 +509,16 @@ def _prepare_conversation_context(
     return current_conversation_id, payload_messages
 
 
-def _sse_event(event: str, data: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+def _sse_event(event: str, data: dict) -> bytes:
+    return b"".join((b"event: ", event.encode(), b"\ndata: ", orjson.dumps(data), b"\n\n"))
+
+
+_SSE_DELTA_PREFIX = b'event: delta\ndata: {"content":'
+
+
+def _sse_delta(content: str) -> bytes:
+    """Per-token event: only the content string is serialized."""
+    return b"".join((_SSE_DELTA_PREFIX, orjson.dumps(content), b"}\n\n"))
 
 
 @app.get("/health")
@@ -820,23 +848,35 @@ async def chat_text(
         "Chat API called with messages: %s", [m.content for m in request.messages]
     )
 
-    # Rate limiting check
-    rate_limit_ok, rate_limit_msg = await rate_limit_service.check_rate_limit()
-    if not rate_limit_ok:
-        return JSONResponse(
-            content={"error": f"Rate limit exceeded: {rate_limit_msg}"},
-            status_code=429,
-        )
-
-    # Check credits for non-free models
+    # Rate limit and credit check, claiming a slot atomically
     model = request.model or "google/gemini-2.0-flash"  # Default to OpenRouter model
-    credit_ok, credit_msg = await rate_limit_service.check_credits(model)
-    if not credit_ok:
+    reservation, limit_status, limit_msg = await rate_limit_service.reserve(model)
+    if reservation is None:
+        label = "Rate limit exceeded" if limit_status == 429 else "Credit limit exceeded"
         return JSONResponse(
-            content={"error": f"Credit limit exceeded: {credit_msg}"},
-            status_code=402,
+            content={"error": f"{label}: {limit_msg}"},
+            status_code=limit_status,
         )
 
+    try:
+        return await _chat_text_reserved(request, db, model, reservation)
+    finally:
+        # No-op once committed; otherwise returns the slot and credits,
+        # including when context preparation raises (e.g. unknown conversation)
+        reservation.release()
+
+
+async def _chat_text_reserved(
+    request: TextChatRequest,
+    db: Optional[SessionType],
+    model: str,
+    reservation: Reservation,
+):
+    """Body of ``chat_text`` once a rate-limit slot is reserved.
+
+    Only settles the reservation via ``commit``; the caller releases it
+    on every other exit.
+    """
     # Only OpenRouter client is supported
     try:
         _ensure_chat_client()
@@ -920,8 +960,8 @@ async def chat_text(
             max_tokens=request.max_tokens or 1024,
             stream=False,
         )
-        # Record usage for rate limiting
-        await rate_limit_service.record_request(model, result.get("tokens", 0))
+        # Settle the reservation against actual usage
+        reservation.commit(result.get("tokens", 0))
     except Exception as e:
         logging.error(f"Chat completion error: {e}")
         return JSONResponse(content={"error": str(e)}, status_code=502)
@@ -1035,7 +1075,7 @@ async def chat_text_stream(
                 content = chunk.get("content")
                 if content:
                     accumulated_chunks.append(str(content))
-                    yield _sse_event("delta", {"content": content})
+                    yield _sse_delta(content)
         except Exception as e:
             logging.error(f"Streaming error: {e}")
             yield _sse_event(
@@ -221,6 +221,14 @@ class BaseProvider(ABC, Generic[T]):
         """Cleanup provider resources (override if needed)."""
         pass
 
+    async def warmup_connection(self) -> None:
+        """Pre-open a connection to the provider API (override if needed).
+
+        Callers can overlap this with local work (file reads, text
+        extraction) so the TCP + TLS handshake is off the critical path.
+        """
+        pass
+
     @abstractmethod
     async def chat_completion(
         self,
@@ -13,6 +13,18 @@ from .base import BaseProvider
 logger = logging.getLogger(__name__)
 
 
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the app-wide pooled client.
+
+    Chat calls and the services' own OpenRouter requests (e.g. image prompt
+    enhancement) then share one connection pool per host.
+    """
+    # Imported here: the services package imports this provider package
+    from ..services._http import get_http_client
+
+    return get_http_client()
+
+
 class OpenRouterProvider(BaseProvider):
     """OpenRouter AI provider."""
 
@@ -96,6 +108,15 @@ class OpenRouterProvider(BaseProvider):
             "X-Title": self.app_name,
         }
 
+    async def warmup_connection(self) -> None:
+        """Open a pooled connection to OpenRouter ahead of a request."""
+        if self.dev_mode or not self.api_key:
+            return
+        try:
+            await _get_http_client().head(self.base_url, timeout=5.0)
+        except httpx.HTTPError as e:
+            logger.debug(f"OpenRouter warmup failed: {e}")
+
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -185,19 +206,18 @@ class OpenRouterProvider(BaseProvider):
         for attempt, delay in enumerate([0] + backoff):
             if delay:
                 await asyncio.sleep(delay)
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url, json=payload, headers=self._headers(), timeout=60.0
-                )
-                if response.status_code in (429, 500, 502, 503, 504) and attempt < len(backoff):
-                    retry_after = response.headers.get("retry-after")
-                    if retry_after:
-                        try:
-                            await asyncio.sleep(float(retry_after))
-                        except Exception:
-                            await asyncio.sleep(delay)
-                    continue
-                return response
+            response = await _get_http_client().post(
+                url, json=payload, headers=self._headers(), timeout=60.0
+            )
+            if response.status_code in (429, 500, 502, 503, 504) and attempt < len(backoff):
+                retry_after = response.headers.get("retry-after")
+                if retry_after:
+                    try:
+                        await asyncio.sleep(float(retry_after))
+                    except Exception:
+                        await asyncio.sleep(delay)
+                continue
+            return response
         return response
 
     async def _unary_response(self, url: str, payload: Dict) -> Dict:
@@ -220,41 +240,40 @@ class OpenRouterProvider(BaseProvider):
         }
 
     async def _stream_response(self, url: str, payload: Dict) -> AsyncIterator[Dict]:
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
-                "POST", url, json=payload, headers=self._headers(), timeout=60.0
-            ) as response:
-                if response.status_code >= 400:
-                    content = await response.aread()
-                    try:
-                        error_data = json.loads(content)
-                        error_msg = error_data.get("error", {}).get(
-                            "message", content.decode()
-                        )
-                    except Exception:
-                        error_msg = content.decode()
-                    yield {
-                        "error": f"OpenRouter API Error {response.status_code}: {error_msg}"
-                    }
-                    return
+        async with _get_http_client().stream(
+            "POST", url, json=payload, headers=self._headers(), timeout=60.0
+        ) as response:
+            if response.status_code >= 400:
+                content = await response.aread()
+                try:
+                    error_data = json.loads(content)
+                    error_msg = error_data.get("error", {}).get(
+                        "message", content.decode()
+                    )
+                except Exception:
+                    error_msg = content.decode()
+                yield {
+                    "error": f"OpenRouter API Error {response.status_code}: {error_msg}"
+                }
+                return
 
-                async for line in response.aiter_lines():
-                    if not line or line.startswith(":"):
-                        continue
+            async for line in response.aiter_lines():
+                if not line or line.startswith(":"):
+                    continue
+
+                if line.startswith("data: "):
+                    data = line[6:]
+                    if data == "[DONE]":
+                        break
 
-                    if line.startswith("data: "):
-                        data = line[6:]
-                        if data == "[DONE]":
-                            break
-
-                        try:
-                            chunk = json.loads(data)
-                            delta = chunk.get("choices", [{}])[0].get("delta", {})
-                            content = delta.get("content")
-                            if content:
-                                yield {"content": content}
-                        except json.JSONDecodeError:
-                            continue
+                    try:
+                        chunk = json.loads(data)
+                        delta = chunk.get("choices", [{}])[0].get("delta", {})
+                        content = delta.get("content")
+                        if content:
+                            yield {"content": content}
+                    except json.JSONDecodeError:
+                        continue
 
     async def _stream_with_fallback(
         self, url: str, payload: Dict, models_to_try: List[str]
@@ -12,6 +12,7 @@ class ImageGenRequest(BaseModel):
     model: Optional[str] = "flux"
     size: Optional[str] = "1024x1024"
     style: Optional[str] = None
+    force_refresh: Optional[bool] = False
 
 
 @router.post("/generate")
@@ -22,7 +23,8 @@ async def generate_image(request: ImageGenRequest):
             prompt=request.prompt,
             model=request.model,
             size=request.size,
-            style=request.style
+            style=request.style,
+            force_refresh=bool(request.force_refresh),
         )
         return {
             "success": True,
@@ -1,5 +1,8 @@
+from collections import OrderedDict
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Tuple
+import asyncio
 import base64
 import logging
 from ..providers import get_provider
@@ -11,6 +14,75 @@ logger = logging.getLogger(__name__)
 # Default model for multimodal tasks
 MULTIMODAL_MODEL = "google/gemini-2.0-flash-001:free"
 
+# Document prompt budget. Token-aware when tiktoken is installed,
+# otherwise a character budget cut on a word boundary.
+DOCUMENT_TOKEN_BUDGET = 8000
+DOCUMENT_SCAN_CHARS = 50000  # Only this much text is ever tokenized
+DOCUMENT_CHAR_BUDGET = 30000
+
+# (extracted text, truncated prompt text) keyed by content type + BLAKE2b
+# digest of the upload, so re-asking about the same document skips the
+# parse and tokenization.
+EXTRACTED_TEXT_CACHE_SIZE = 256
+_extracted_text_cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+
+_encoding = None
+_tiktoken_missing = False
+
+
+def _get_encoding():
+    """Load the cl100k_base encoding once; None falls back to characters.
+
+    A missing tiktoken is remembered, but a failed load (the first use
+    downloads the BPE file) is retried on the next call. Blocking, so call
+    it from a thread.
+    """
+    global _encoding, _tiktoken_missing
+    if _encoding is not None or _tiktoken_missing:
+        return _encoding
+    try:
+        import tiktoken
+    except ImportError:
+        _tiktoken_missing = True
+        logger.info("tiktoken not installed, truncating documents by characters")
+        return None
+    try:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Failed to load tiktoken encoding, will retry: {e}")
+    return _encoding
+
+
+@router.on_event("startup")
+async def _load_encoding():
+    """Fetch the encoding at startup so the first upload doesn't wait on it."""
+    await run_in_threadpool(_get_encoding)
+
+
+def _truncate_document(text: str) -> str:
+    """Trim document text to the prompt budget on a token or word boundary.
+
+    CPU-bound (tokenizes up to DOCUMENT_SCAN_CHARS); run it in a thread.
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text[:DOCUMENT_SCAN_CHARS], disallowed_special=())
+        if len(text) <= DOCUMENT_SCAN_CHARS and len(tokens) <= DOCUMENT_TOKEN_BUDGET:
+            return text
+        return encoding.decode(tokens[:DOCUMENT_TOKEN_BUDGET])
+
+    if len(text) <= DOCUMENT_CHAR_BUDGET:
+        return text
+    cut = text.rfind(" ", 0, DOCUMENT_CHAR_BUDGET)
+    return text[:cut if cut > 0 else DOCUMENT_CHAR_BUDGET]
+
+
+def _cache_extracted_text(key: str, text: Tuple[str, str]) -> None:
+    _extracted_text_cache[key] = text
+    _extracted_text_cache.move_to_end(key)
+    if len(_extracted_text_cache) > EXTRACTED_TEXT_CACHE_SIZE:
+        _extracted_text_cache.popitem(last=False)
+
 
 @router.post("/api/vision/analyze")
 async def analyze_image(
@@ -19,8 +91,9 @@ async def analyze_image(
 ):
     """Analyze an uploaded image using Gemini 2.0 Flash."""
     try:
-        # Read and encode image
-        contents = await file.read()
+        # Read the image while the provider connection warms up
+        provider = get_provider()
+        contents, _ = await asyncio.gather(file.read(), provider.warmup_connection())
         base64_image = base64.b64encode(contents).decode("utf-8")
         mime_type = file.content_type or "image/jpeg"
 
@@ -40,7 +113,6 @@ async def analyze_image(
             }
         ]
 
-        provider = get_provider()
         response = await provider.chat_completion(
             messages=messages,
             model=MULTIMODAL_MODEL,
@@ -68,7 +140,8 @@ async def analyze_video(
         # For larger videos, we would need to upload to a storage service first.
         # Gemini 2.0 Flash supports video input.
 
-        contents = await file.read()
+        provider = get_provider()
+        contents, _ = await asyncio.gather(file.read(), provider.warmup_connection())
         base64_video = base64.b64encode(contents).decode("utf-8")
         mime_type = file.content_type or "video/mp4"
 
@@ -88,7 +161,6 @@ async def analyze_video(
             }
         ]
 
-        provider = get_provider()
         response = await provider.chat_completion(
             messages=messages,
             model=MULTIMODAL_MODEL,
@@ -112,11 +184,27 @@ async def extract_document(
 ):
     """Extract text from document and analyze with Gemini 2.0 Flash."""
     try:
-        # Save file temporarily to extract text
-        saved_file = await file_service.save_file(file)
+        # Stream to disk, hashing the chunks on the way
+        saved_file = await file_service.save_file(file, digest=True)
+        cache_key = f"{file.content_type}:{saved_file['digest']}"
+        provider = get_provider()
 
-        # Extract text
-        text_content = await file_service.extract_text(saved_file["path"], saved_file["content_type"])
+        cached = _extracted_text_cache.get(cache_key)
+        if cached is not None:
+            _extracted_text_cache.move_to_end(cache_key)
+            text_content, prompt_text = cached
+            await file_service.delete_file(saved_file["path"])
+        else:
+            # Extract text while the provider connection warms up
+            text_content, _ = await asyncio.gather(
+                file_service.extract_text(saved_file["path"], saved_file["content_type"]),
+                provider.warmup_connection(),
+            )
+            prompt_text = (
+                await run_in_threadpool(_truncate_document, text_content)
+                if text_content else ""
+            )
+            _cache_extracted_text(cache_key, (text_content, prompt_text))
 
         if not text_content:
             return {"text": "Could not extract text from this document.", "description": "No text found."}
@@ -129,11 +217,10 @@ async def extract_document(
             },
             {
                 "role": "user",
-                "content": f"{prompt}\n\nDocument Content:\n{text_content[:30000]}"  # Truncate if too large
+                "content": f"{prompt}\n\nDocument Content:\n{prompt_text}"
             }
         ]
 
-        provider = get_provider()
         response = await provider.chat_completion(
             messages=messages,
             model=MULTIMODAL_MODEL,
@@ -2,11 +2,13 @@
 
 from typing import Optional
 
+import orjson
 from fastapi import (
     APIRouter,
     File,
     Form,
     HTTPException,
+    Response,
     UploadFile,
     WebSocket,
     WebSocketDisconnect,
@@ -48,27 +50,147 @@ async def transcribe_audio(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Raw PCM streaming (LocalAgreement-2)
+PCM_ENCODING = "pcm_s16le"
+PCM_SAMPLE_RATE = 16000
+PCM_BYTES_PER_SECOND = PCM_SAMPLE_RATE * 2
+PARTIAL_DECODE_BYTES = PCM_BYTES_PER_SECOND  # Re-decode after ~1 s of new audio
+BUFFER_TRIMMING_SEC = 15.0
+PROMPT_MAX_CHARS = 200
+
+
+def _segment_words(segments: list) -> list[str]:
+    return [word for segment in segments for word in segment["text"].split()]
+
+
+class _LocalAgreement:
+    """LocalAgreement-2 policy over a rolling PCM buffer.
+
+    A word is confirmed once two consecutive decodes of the buffer agree on
+    it. Once the buffer grows past BUFFER_TRIMMING_SEC, audio covered by
+    fully confirmed segments is dropped so re-decodes stay bounded.
+    """
+
+    def __init__(self):
+        self.audio = b""
+        self.language: Optional[str] = None
+        self.confirmed: list[str] = []
+        self._buffer_confirmed = 0  # Confirmed words still inside self.audio
+        self._previous: list[str] = []
+
+    @property
+    def prompt(self) -> Optional[str]:
+        """Confirmed text that has already been trimmed out of the buffer."""
+        trimmed = self.confirmed[: len(self.confirmed) - self._buffer_confirmed]
+        return " ".join(trimmed)[-PROMPT_MAX_CHARS:] or None
+
+    def update(self, result: dict) -> list[str]:
+        """Fold a new hypothesis in and return the newly confirmed words."""
+        self.language = self.language or result["language"]
+        words = _segment_words(result["segments"])
+
+        agreed = 0
+        for previous, current in zip(self._previous, words):
+            if previous != current:
+                break
+            agreed += 1
+
+        new_words = words[self._buffer_confirmed:agreed]
+        self.confirmed.extend(new_words)
+        self._buffer_confirmed = max(self._buffer_confirmed, agreed)
+        self._previous = words
+        self._trim(result["segments"])
+        return new_words
+
+    def finish(self, result: dict) -> str:
+        """Flush the final hypothesis and return the full transcript."""
+        tail = _segment_words(result["segments"])[self._buffer_confirmed:]
+        return " ".join(self.confirmed + tail)
+
+    def _trim(self, segments: list) -> None:
+        if len(self.audio) < BUFFER_TRIMMING_SEC * PCM_BYTES_PER_SECOND:
+            return
+
+        cut_words, cut_sec = 0, 0.0
+        for segment in segments:
+            words = cut_words + len(segment["text"].split())
+            if words > self._buffer_confirmed:
+                break
+            cut_words, cut_sec = words, segment["end"]
+        if not cut_words:
+            return
+
+        self.audio = self.audio[int(cut_sec * PCM_SAMPLE_RATE) * 2:]
+        self._buffer_confirmed -= cut_words
+        self._previous = self._previous[cut_words:]
+
+
 @router.websocket("/transcribe-stream")
 async def transcribe_stream(websocket: WebSocket):
     """WebSocket endpoint for streaming audio transcription.
 
     Client sends binary audio chunks. Send a text message 'end' to trigger transcription.
     Response: JSON with success/text/language/segments.
+
+    Connect with ``?encoding=pcm_s16le`` and send raw 16 kHz mono PCM to get
+    incremental results: every ~1 s of audio the buffer is re-decoded and
+    newly confirmed words are sent as ``{"partial": [...], "text": ...}``.
     """
     await websocket.accept()
-    buffer = bytearray()
+    # Collect frames and join once at "end" so the buffer is allocated a
+    # single time at its final size instead of growing frame by frame.
+    chunks: list[bytes] = []
+    total = 0
+    agreement = (
+        _LocalAgreement()
+        if websocket.query_params.get("encoding") == PCM_ENCODING
+        else None
+    )
+    decoded_at = 0
     try:
         while True:
             message = await websocket.receive()
             if "bytes" in message and message["bytes"] is not None:
-                buffer.extend(message["bytes"])
+                chunks.append(message["bytes"])
+                total += len(message["bytes"])
+
+                if agreement and total - decoded_at >= PARTIAL_DECODE_BYTES:
+                    agreement.audio += b"".join(chunks)
+                    chunks.clear()
+                    decoded_at = total
+                    result = await whisper_service.transcribe_pcm(
+                        agreement.audio,
+                        language=agreement.language,
+                        initial_prompt=agreement.prompt,
+                    )
+                    new_words = agreement.update(result)
+                    if new_words:
+                        await websocket.send_json(
+                            {
+                                "success": True,
+                                "partial": new_words,
+                                "text": " ".join(agreement.confirmed),
+                            }
+                        )
             elif "text" in message:
                 text = (message["text"] or "").strip().lower()
                 if text == "end":
                     # Transcribe accumulated audio
-                    result = await whisper_service.transcribe(
-                        bytes(buffer), language=None
-                    )
+                    if agreement:
+                        agreement.audio += b"".join(chunks)
+                        result = {"language": agreement.language, "segments": []}
+                        if agreement.audio:
+                            result = await whisper_service.transcribe_pcm(
+                                agreement.audio,
+                                language=agreement.language,
+                                initial_prompt=agreement.prompt,
+                            )
+                        result["text"] = agreement.finish(result)
+                    else:
+                        audio_bytes = b"".join(chunks)
+                        result = await whisper_service.transcribe(
+                            audio_bytes, language=None
+                        )
                     await websocket.send_json(
                         {
                             "success": True,
@@ -117,29 +239,32 @@ async def detect_language(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# This is a subset of Whisper supported languages
+SUPPORTED_LANGUAGES = [
+    {"code": "en", "name": "English"},
+    {"code": "hi", "name": "Hindi"},
+    {"code": "ta", "name": "Tamil"},
+    {"code": "te", "name": "Telugu"},
+    {"code": "mr", "name": "Marathi"},
+    {"code": "bn", "name": "Bengali"},
+    {"code": "gu", "name": "Gujarati"},
+    {"code": "kn", "name": "Kannada"},
+    {"code": "ml", "name": "Malayalam"},
+    {"code": "pa", "name": "Punjabi"},
+    {"code": "ur", "name": "Urdu"},
+    {"code": "es", "name": "Spanish"},
+    {"code": "fr", "name": "French"},
+    {"code": "de", "name": "German"},
+    {"code": "zh", "name": "Chinese"},
+    {"code": "ja", "name": "Japanese"},
+    {"code": "ko", "name": "Korean"},
+]
+
+# Static payload, serialized once at import
+_LANGUAGES_RESPONSE = orjson.dumps({"success": True, "languages": SUPPORTED_LANGUAGES})
+
+
 @router.get("/languages")
 async def get_supported_languages():
     """Get list of supported languages."""
-    # This is a subset of Whisper supported languages
-    return {
-        "success": True,
-        "languages": [
-            {"code": "en", "name": "English"},
-            {"code": "hi", "name": "Hindi"},
-            {"code": "ta", "name": "Tamil"},
-            {"code": "te", "name": "Telugu"},
-            {"code": "mr", "name": "Marathi"},
-            {"code": "bn", "name": "Bengali"},
-            {"code": "gu", "name": "Gujarati"},
-            {"code": "kn", "name": "Kannada"},
-            {"code": "ml", "name": "Malayalam"},
-            {"code": "pa", "name": "Punjabi"},
-            {"code": "ur", "name": "Urdu"},
-            {"code": "es", "name": "Spanish"},
-            {"code": "fr", "name": "French"},
-            {"code": "de", "name": "German"},
-            {"code": "zh", "name": "Chinese"},
-            {"code": "ja", "name": "Japanese"},
-            {"code": "ko", "name": "Korean"},
-        ],
-    }
+    return Response(content=_LANGUAGES_RESPONSE, media_type="application/json")
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 from fastapi.responses import StreamingResponse
+import asyncio
+import orjson
 import os
 import time
 import logging
@@ -7,6 +9,14 @@ import logging
 router = APIRouter(prefix="/api/speedtest", tags=["Speedtest"])
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 512 * 1024  # 512KB chunks
+YIELD_EVERY_CHUNKS = 4
+RANDOM_BUFFER_SIZE = 16 * 1024 * 1024
+
+# Random payload generated once per process; downloads slice it without
+# copying so the CPU never bottlenecks the network.
+_RANDOM_BUFFER = memoryview(os.urandom(RANDOM_BUFFER_SIZE))
+
 
 @router.get("/download")
 async def download(size: int = 25 * 1024 * 1024):
@@ -15,18 +25,20 @@ async def download(size: int = 25 * 1024 * 1024):
     Returns a stream of random bytes of the specified size.
     Default size is 25MB for accurate high-speed testing.
     """
-    def generate_random_bytes():
-        # Using a pre-generated chunk for performance (don't want CPU to bottleneck the network)
-        chunk_size = 512 * 1024  # 512KB chunks
-        chunk = os.urandom(chunk_size)
+    # Async so Starlette iterates it on the event loop instead of handing
+    # every next() of a sync generator to the threadpool.
+    async def generate_random_bytes():
         bytes_sent = 0
+        chunks = 0
         while bytes_sent < size:
-            take = min(chunk_size, size - bytes_sent)
-            if take == chunk_size:
-                yield chunk
-            else:
-                yield chunk[:take]
+            offset = bytes_sent % RANDOM_BUFFER_SIZE
+            take = min(CHUNK_SIZE, size - bytes_sent, RANDOM_BUFFER_SIZE - offset)
+            yield _RANDOM_BUFFER[offset:offset + take]
             bytes_sent += take
+            chunks += 1
+            if chunks % YIELD_EVERY_CHUNKS == 0:
+                # Let other requests run between bursts of sends
+                await asyncio.sleep(0)
 
     return StreamingResponse(
         generate_random_bytes(),
@@ -47,8 +59,16 @@ async def upload(request: Request):
     """
     size = 0
     start_time = time.time()
-    async for chunk in request.stream():
-        size += len(chunk)
+    # Drain ASGI body frames directly: only a running byte count is kept,
+    # skipping the request.stream() generator layer for every frame.
+    receive = request.receive
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        size += len(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
 
     duration = time.time() - start_time
     logger.info(f"Speedtest Upload: {size} bytes in {duration:.2f}s")
@@ -63,4 +83,7 @@ async def upload(request: Request):
 @router.get("/ping")
 async def ping():
     """Simple ping for latency measurement."""
-    return {"status": "pong", "timestamp": time.time()}
+    return Response(
+        content=orjson.dumps({"status": "pong", "timestamp": time.time()}),
+        media_type="application/json",
+    )
@@ -9,15 +9,21 @@ Features (inspired by Chatterbox Turbo):
 
 Endpoints:
 - POST /api/tts - Text to speech with emotion
+- POST /api/tts/audio - Text to speech as raw audio bytes
+- POST /api/tts/stream - Streaming PCM audio
 - POST /api/tts/voice-response - Full voice conversation pipeline
+- POST /api/tts/voice-response/stream - Voice pipeline as streaming PCM
 - GET /api/tts/emotions - List supported emotions
 - GET /api/tts/voices - List voices
 - GET /api/tts/languages - List languages
 """
 
-from typing import Optional, List, Dict
+import hashlib
+from typing import Optional, List, Dict, Tuple
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from ..services.tts_service import tts_service, EmotionDetector
@@ -43,6 +49,53 @@ class VoiceConversationRequest(BaseModel):
 
 router = APIRouter(prefix="/api/tts", tags=["tts"])
 
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _static_payload(content: dict) -> Tuple[bytes, str]:
+    """Serialize a static response body once and derive its ETag."""
+    # default=dict covers the read-only MappingProxyType service metadata
+    body = orjson.dumps(content, default=dict)
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _static_response(request: Request, payload: Tuple[bytes, str]) -> Response:
+    """Serve a pre-serialized body, or 304 if the client already has it."""
+    body, etag = payload
+    headers = {"ETag": etag, "Cache-Control": STATIC_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in if_none_match or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Static metadata payloads, serialized once at import (change only on deploy)
+_EMOTIONS_PAYLOAD = _static_payload({
+    "success": True,
+    "paralinguistic_tags": list(EmotionDetector.PARALINGUISTIC_TAGS.keys()),
+    "auto_detected_emotions": list(EmotionDetector.EMOTION_STYLES.keys()),
+    "emotion_keywords": EmotionDetector.EMOTION_KEYWORDS,
+    "note": "Use [tags] in text or let auto_emotion detect mood"
+})
+_VOICES_PAYLOAD = _static_payload({"success": True, **tts_service.get_voices()})
+_LANGUAGES_PAYLOAD = _static_payload({"success": True, **tts_service.get_languages()})
+_INDIAN_LANGUAGES_PAYLOAD = _static_payload({
+    "success": True,
+    "languages": tts_service.get_indian_languages(),
+    "count": len(tts_service.INDIAN_LANGUAGES),
+    "note": "Gemini TTS supports 6 Indian languages with native pronunciation"
+})
+# Fixed for the life of the process, but not cacheable by clients
+_HEALTH_RESPONSE = orjson.dumps({
+    "success": True,
+    "configured": bool(tts_service.api_key),
+    "model": tts_service.TTS_MODEL,
+    "llm_model": tts_service.LLM_MODEL,
+    "voices": len(tts_service.ALL_VOICES),
+    "languages": len(tts_service.LANGUAGES),
+    "indian_languages": len(tts_service.INDIAN_LANGUAGES),
+})
+
 
 @router.post("")
 @router.post("/")
@@ -69,6 +122,57 @@ async def synthesize(req: TTSRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/audio")
+async def synthesize_audio(req: TTSRequest):
+    """Text to speech returned as raw audio (24kHz, 16-bit PCM).
+
+    Same inputs as POST /api/tts, but the body is the audio itself rather
+    than base64 inside JSON: a third smaller and nothing to decode.
+    """
+    try:
+        audio, mime_type = await tts_service.text_to_speech_audio(
+            text=req.text,
+            voice=req.voice or "Puck",
+            style=req.style,
+            auto_emotion=req.auto_emotion is not False,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=audio, media_type=mime_type)
+
+
+@router.post("/stream")
+async def synthesize_stream(req: TTSRequest):
+    """Stream raw PCM audio (24kHz, 16-bit mono) as it is generated.
+
+    Playback can start on the first chunk instead of waiting for the
+    whole utterance. Same inputs as POST /api/tts.
+    """
+    try:
+        audio = tts_service.text_to_speech_stream(
+            text=req.text,
+            voice=req.voice or "Puck",
+            style=req.style,
+            auto_emotion=req.auto_emotion is not False,
+        )
+        # Pull the first chunk before responding so upstream failures
+        # still surface as an HTTP error instead of a truncated stream
+        first = await anext(audio, b"")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def body():
+        yield first
+        async for chunk in audio:
+            yield chunk
+
+    return StreamingResponse(body(), media_type="audio/L16; rate=24000")
+
+
 @router.post("/voice-response")
 async def voice_response(req: VoiceConversationRequest):
     """Complete voice AI pipeline: Understand → Generate → Speak.
@@ -98,8 +202,39 @@ async def voice_response(req: VoiceConversationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/voice-response/stream")
+async def voice_response_stream(req: VoiceConversationRequest):
+    """Voice pipeline streamed as raw PCM audio (24kHz, 16-bit mono).
+
+    The reply is voiced sentence by sentence while the model is still
+    generating, so playback starts after the first sentence rather than
+    after the whole reply. Same inputs as POST /api/tts/voice-response.
+    """
+    try:
+        audio = tts_service.generate_voice_response_stream(
+            user_message=req.message,
+            conversation_history=req.conversation_history,
+            voice=req.voice or "Puck",
+            language=req.language or "en-US",
+            stt_confidence=req.stt_confidence or 1.0,
+        )
+        # Prime the first chunk so failures surface as an HTTP error
+        first = await anext(audio, b"")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def body():
+        yield first
+        async for chunk in audio:
+            yield chunk
+
+    return StreamingResponse(body(), media_type="audio/L16; rate=24000")
+
+
 @router.get("/emotions")
-async def list_emotions():
+async def list_emotions(request: Request):
     """List supported emotion tags for expressive TTS.
 
     Inspired by Chatterbox Turbo's paralinguistic tags.
@@ -117,17 +252,11 @@ async def list_emotions():
     - happy, sad, angry, surprised
     - calm, empathetic, enthusiastic, thoughtful
     """
-    return {
-        "success": True,
-        "paralinguistic_tags": list(EmotionDetector.PARALINGUISTIC_TAGS.keys()),
-        "auto_detected_emotions": list(EmotionDetector.EMOTION_STYLES.keys()),
-        "emotion_keywords": EmotionDetector.EMOTION_KEYWORDS,
-        "note": "Use [tags] in text or let auto_emotion detect mood"
-    }
+    return _static_response(request, _EMOTIONS_PAYLOAD)
 
 
 @router.get("/voices")
-async def list_voices():
+async def list_voices(request: Request):
     """List available Gemini TTS voices.
 
     Returns voices grouped by style:
@@ -137,25 +266,17 @@ async def list_voices():
     - playful: Io, Echo, Calliope
     - emotional: Erato, Melpomene, Thalia
     """
-    voices = tts_service.get_voices()
-    return {
-        "success": True,
-        **voices,
-    }
+    return _static_response(request, _VOICES_PAYLOAD)
 
 
 @router.get("/languages")
-async def list_languages():
+async def list_languages(request: Request):
     """List supported languages (24 total including 6 Indian languages)."""
-    lang_data = tts_service.get_languages()
-    return {
-        "success": True,
-        **lang_data,
-    }
+    return _static_response(request, _LANGUAGES_PAYLOAD)
 
 
 @router.get("/languages/indian")
-async def list_indian_languages():
+async def list_indian_languages(request: Request):
     """List Indian languages supported by Gemini TTS.
 
     Supported:
@@ -166,24 +287,10 @@ async def list_indian_languages():
     - Telugu (te-IN) - తెలుగు
     - English India (en-IN)
     """
-    return {
-        "success": True,
-        "languages": tts_service.get_indian_languages(),
-        "count": len(tts_service.INDIAN_LANGUAGES),
-        "note": "Gemini TTS supports 6 Indian languages with native pronunciation"
-    }
+    return _static_response(request, _INDIAN_LANGUAGES_PAYLOAD)
 
 
 @router.get("/health")
 async def health_check():
     """Check if TTS service is configured."""
-    has_key = bool(tts_service.api_key)
-    return {
-        "success": True,
-        "configured": has_key,
-        "model": tts_service.TTS_MODEL,
-        "llm_model": tts_service.LLM_MODEL,
-        "voices": len(tts_service.ALL_VOICES),
-        "languages": len(tts_service.LANGUAGES),
-        "indian_languages": len(tts_service.INDIAN_LANGUAGES),
-    }
+    return Response(content=_HEALTH_RESPONSE, media_type="application/json")
@@ -11,15 +11,19 @@ Features:
 
 from __future__ import annotations
 
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Annotated, Any, Literal
 
 from pydantic import (
+    AliasChoices,
     BaseModel,
     ConfigDict,
     EmailStr,
     Field,
+    StringConstraints,
+    TypeAdapter,
     computed_field,
     field_validator,
     model_validator,
@@ -62,20 +66,60 @@ class BaseSchema(BaseModel):
     )
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_DATETIME_ADAPTER: TypeAdapter[datetime] = TypeAdapter(datetime)
+
+
 class TimestampMixin(BaseModel):
-    """Mixin for timestamp fields."""
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    """Mixin for timestamp fields.
+
+    Creation time is stored as ``time.time_ns()``; the ``created_at``
+    datetime is only built when read or serialized. A ``created_at`` passed
+    in (or read from an ORM object) is accepted and converted.
+    """
+    created_at_ns: int = Field(
+        default_factory=time.time_ns,
+        validation_alias=AliasChoices("created_at_ns", "created_at"),
+        exclude=True,
+    )
     updated_at: datetime | None = None
 
+    @field_validator("created_at_ns", mode="before")
+    @classmethod
+    def _datetime_to_ns(cls, v: Any) -> Any:
+        """Convert datetimes (naive ones are UTC) to epoch nanoseconds.
+
+        ISO strings, e.g. ``created_at`` from ``model_dump_json()``, are
+        parsed first so JSON input still round-trips.
+        """
+        if isinstance(v, str):
+            v = _DATETIME_ADAPTER.validate_python(v)
+        if isinstance(v, datetime):
+            if v.tzinfo is None:
+                v = v.replace(tzinfo=timezone.utc)
+            return (v - _EPOCH) // timedelta(microseconds=1) * 1000
+        return v
+
+    @computed_field
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a UTC datetime."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9, tz=timezone.utc)
+
 
 # ==============================================================================
 # User Schemas
 # ==============================================================================
 
+# Kept as a str so pydantic-core compiles it once with its Rust regex engine;
+# a compiled re.Pattern would switch validation to Python's re module.
+USERNAME_PATTERN = r"^[a-zA-Z0-9_-]+$"
+
+
 class UserBase(BaseSchema):
     """Base user schema."""
     email: EmailStr
-    username: Annotated[str, Field(min_length=3, max_length=50, pattern=r"^[a-zA-Z0-9_-]+$")]
+    username: Annotated[str, Field(min_length=3, max_length=50, pattern=USERNAME_PATTERN)]
 
 
 class UserCreate(UserBase):
@@ -86,13 +130,26 @@ class UserCreate(UserBase):
     @classmethod
     def validate_password_strength(cls, v: str) -> str:
         """Ensure password meets strength requirements."""
-        if not any(c.isupper() for c in v):
+        # Single pass building an upper/lower/digit bitmask; stops as soon
+        # as all three have been seen.
+        flags = 0
+        for c in v:
+            if c.isupper():
+                flags |= 1
+            elif c.islower():
+                flags |= 2
+            elif c.isdigit():
+                flags |= 4
+            else:
+                continue
+            if flags == 7:
+                return v
+
+        if not flags & 1:
             raise ValueError("Password must contain at least one uppercase letter")
-        if not any(c.islower() for c in v):
+        if not flags & 2:
             raise ValueError("Password must contain at least one lowercase letter")
-        if not any(c.isdigit() for c in v):
-            raise ValueError("Password must contain at least one digit")
-        return v
+        raise ValueError("Password must contain at least one digit")
 
 
 class UserLogin(BaseSchema):
@@ -134,18 +191,12 @@ class ChatMessage(BaseSchema):
 
     model_config = ConfigDict(extra="allow")  # Allow extra fields for flexibility
 
-    role: MessageRole | str
+    # Lowercased by pydantic-core itself; MessageRole members validate to
+    # their string value. Unknown roles are still accepted.
+    role: Annotated[str, StringConstraints(to_lower=True)]
     content: str = Field(min_length=1, max_length=100000)
     name: str | None = None  # For function messages
 
-    @field_validator("role", mode="before")
-    @classmethod
-    def normalize_role(cls, v: str | MessageRole) -> str:
-        """Normalize role to lowercase string."""
-        if isinstance(v, MessageRole):
-            return v.value
-        return v.lower() if isinstance(v, str) else str(v)
-
 
 class TextChatRequest(BaseSchema):
     """Request schema for text chat."""
@@ -166,30 +217,35 @@ class TextChatRequest(BaseSchema):
     presence_penalty: float | None = Field(default=None, ge=-2.0, le=2.0)
     stop: list[str] | None = Field(default=None, max_length=4)
 
-    @model_validator(mode="after")
-    def validate_messages(self) -> "TextChatRequest":
-        """Ensure messages are valid."""
-        if not self.messages:
-            raise ValueError("At least one message is required")
-        return self
-
 
 class ChatUsage(BaseSchema):
     """Token usage statistics."""
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
+    # Derived from the validated total_tokens, so serializing doesn't call
+    # back into Python; any value passed in is ignored.
+    estimated_cost: float = 0.0
 
-    @computed_field
-    @property
-    def estimated_cost(self) -> float:
+    @model_validator(mode="after")
+    def _estimate_cost(self) -> ChatUsage:
         """Estimate cost based on typical pricing."""
-        # Rough estimate: $0.001 per 1K tokens
-        return self.total_tokens * 0.000001
+        # Rough estimate: $0.001 per 1K tokens. Written to __dict__ so the
+        # assignment isn't validated again (validate_assignment is on).
+        self.__dict__["estimated_cost"] = self.total_tokens * 0.000001
+        return self
+
+
+def _now_ts() -> int:
+    """Current Unix time in whole seconds."""
+    return int(time.time())
 
 
 class ChatChoice(BaseSchema):
     """Single chat completion choice."""
+
+    model_config = ConfigDict(frozen=True)  # Built once, read-only
+
     index: int = 0
     message: ChatMessage
     finish_reason: Literal["stop", "length", "content_filter", None] = None
@@ -197,9 +253,12 @@ class ChatChoice(BaseSchema):
 
 class ChatCompletionResponse(BaseSchema):
     """Chat completion response."""
+
+    model_config = ConfigDict(frozen=True)  # Built once, read-only
+
     id: str
     object: Literal["chat.completion"] = "chat.completion"
-    created: int = Field(default_factory=lambda: int(datetime.utcnow().timestamp()))
+    created: int = Field(default_factory=_now_ts)
     model: str
     choices: list[ChatChoice]
     usage: ChatUsage | None = None
@@ -207,6 +266,9 @@ class ChatCompletionResponse(BaseSchema):
 
 class StreamDelta(BaseSchema):
     """Streaming response delta."""
+
+    model_config = ConfigDict(frozen=True)  # Built once, read-only
+
     type: Literal["delta", "done", "error", "metadata"] = "delta"
     content: str = ""
     finish_reason: str | None = None
@@ -291,6 +353,9 @@ class ImageGenerationRequest(BaseSchema):
 
 class GeneratedImage(BaseSchema):
     """Generated image response."""
+
+    model_config = ConfigDict(frozen=True)  # Built once, read-only
+
     url: str
     revised_prompt: str | None = None
 
@@ -340,6 +405,9 @@ class KnowledgeSearchRequest(BaseSchema):
 
 class KnowledgeDocument(BaseSchema):
     """Knowledge document."""
+
+    model_config = ConfigDict(frozen=True)  # Built once, read-only
+
     id: str
     content: str
     score: float
@@ -0,0 +1,46 @@
+"""Shared outbound HTTP client for the whole app.
+
+One pooled client lets Image/TTS calls and the OpenRouter chat provider
+reuse keep-alive connections to the same hosts instead of paying a TCP +
+TLS handshake per request. Callers pass their own per-request ``timeout``.
+"""
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx[http2] extra)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Request bodies are pre-encoded with orjson (``content=orjson.dumps(...)``),
+# so callers without their own headers send this content type explicitly
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        # HTTP/2 multiplexes concurrent requests to a host over one
+        # connection instead of queueing on the pool
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=300,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (call on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
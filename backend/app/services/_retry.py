@@ -0,0 +1,66 @@
+"""Bounded retry for outbound POSTs to model APIs.
+
+Each attempt gets its own timeout, short first and longer after, so a
+stalled connection is abandoned early instead of holding the request for
+the full timeout. Transient upstream statuses, failed connects and
+timeouts are retried after a jittered backoff; anything else is returned
+to the caller as-is.
+
+A read timeout does not mean the upstream gave up: for billed,
+non-idempotent generations pass ``retry_timeouts=False`` so a slow call is
+not paid for twice. Connect failures are always retried, since the
+request never reached the server.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Sequence
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+async def retry_post(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    timeouts: Sequence[float] = (5.0, 15.0, 60.0),
+    backoffs: Sequence[float] = (0.2, 1.0),
+    jitter: float = 0.3,
+    retry_on: frozenset = RETRY_STATUSES,
+    retry_timeouts: bool = True,
+    **kwargs,
+) -> httpx.Response:
+    """POST with one attempt per entry in ``timeouts``.
+
+    The last response is returned even if its status is retryable, so
+    callers keep their own error handling. A connect failure or timeout
+    on the last attempt is raised, as is any timeout once the request was
+    sent when ``retry_timeouts`` is off.
+    """
+    last = len(timeouts) - 1
+    for attempt, timeout in enumerate(timeouts):
+        try:
+            response = await client.post(url, timeout=timeout, **kwargs)
+            if response.status_code not in retry_on or attempt == last:
+                return response
+            reason = f"status {response.status_code}"
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            # Never sent, so safe to retry even for non-idempotent calls
+            if attempt == last:
+                raise
+            reason = type(e).__name__
+        except httpx.TimeoutException:
+            if attempt == last or not retry_timeouts:
+                raise
+            reason = f"timeout after {timeout}s"
+
+        delay = backoffs[min(attempt, len(backoffs) - 1)]
+        delay *= 1 + random.uniform(-jitter, jitter)
+        logger.warning("POST %s failed (%s), retry %d in %.2fs",
+                       url.split("?", 1)[0], reason, attempt + 1, delay)
+        await asyncio.sleep(delay)
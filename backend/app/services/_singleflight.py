@@ -0,0 +1,34 @@
+"""Single-flight deduplication for identical concurrent upstream calls.
+
+When several requests for the same payload arrive together, only the
+first one calls the API; the rest await its result. Pair with a cache so
+later (non-concurrent) repeats are served from there.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+def _forget(inflight: Dict[str, asyncio.Task], key: str, task: asyncio.Task) -> None:
+    if inflight.get(key) is task:
+        del inflight[key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved even if every waiter went away
+
+
+async def single_flight(
+    inflight: Dict[str, asyncio.Task],
+    key: str,
+    factory: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Await the in-flight call for ``key``, starting it if there is none.
+
+    The shared task is shielded, so one caller disconnecting does not
+    cancel the call for the others. Exceptions reach every waiter.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        inflight[key] = task
+        task.add_done_callback(lambda t: _forget(inflight, key, t))
+    return await asyncio.shield(task)
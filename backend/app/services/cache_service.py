@@ -3,19 +3,25 @@ Cache Service for AssistMe
 Provides Redis-based caching with in-memory fallback
 """
 
-import json
 import logging
 import os
-from typing import Any, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+MEMORY_CACHE_MAX_SIZE = 10000
+
 
 class CacheService:
     def __init__(self):
         self.redis_url = os.getenv("REDIS_URL")
         self.redis = None
-        self._memory_cache = {}
+        # key -> (expires_at monotonic seconds, value), oldest first
+        self._memory_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
         self.enabled = False
 
         if self.redis_url:
@@ -36,8 +42,8 @@ class CacheService:
             if self.redis:
                 value = await self.redis.get(key)
                 if value:
-                    return json.loads(value)
-            return self._memory_cache.get(key)
+                    return orjson.loads(value)
+            return self._memory_get(key)
         except Exception as e:
             logger.warning(f"Cache get error: {e}")
             return None
@@ -45,17 +51,35 @@ class CacheService:
     async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
         """Set value in cache with TTL (seconds)"""
         try:
-            serialized = json.dumps(value)
+            # Non-str dict keys are stringified, as json.dumps did
+            serialized = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
             if self.redis:
                 await self.redis.set(key, serialized, ex=ttl)
             else:
-                self._memory_cache[key] = value
-                # Note: In-memory cache doesn't implement TTL cleanup in this simple version
+                self._memory_set(key, value, ttl)
             return True
         except Exception as e:
             logger.warning(f"Cache set error: {e}")
             return False
 
+    def _memory_get(self, key: str) -> Optional[Any]:
+        entry = self._memory_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._memory_cache[key]
+            return None
+        self._memory_cache.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: Any, ttl: int) -> None:
+        """Store with expiry, evicting least recently used entries past the cap."""
+        self._memory_cache[key] = (time.monotonic() + ttl, value)
+        self._memory_cache.move_to_end(key)
+        while len(self._memory_cache) > MEMORY_CACHE_MAX_SIZE:
+            self._memory_cache.popitem(last=False)
+
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         try:
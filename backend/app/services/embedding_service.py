@@ -12,6 +12,15 @@ from starlette.concurrency import run_in_threadpool
 
 logger = logging.getLogger(__name__)
 
+ENCODE_BATCH_SIZE = 64
+
+# Exact flat search is fast enough for small corpora; switch to an HNSW
+# graph (approximate, sub-linear queries) once the corpus gets large.
+HNSW_MIN_DOCUMENTS = 10000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_MIN_EF_SEARCH = 32
+
 
 class EmbeddingService:
     """Service for generating and searching embeddings."""
@@ -37,6 +46,9 @@ class EmbeddingService:
             self._is_loading = True
             logger.info(f"Loading Embedding model: {self.model_name}...")
             self.model = SentenceTransformer(self.model_name)
+            if self.model.device.type == "cuda":
+                # Half precision halves memory traffic; outputs are still float32
+                self.model.half()
             logger.info("Embedding model loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load Embedding model: {e}")
@@ -44,13 +56,23 @@ class EmbeddingService:
         finally:
             self._is_loading = False
 
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode to unit-length float32 vectors (inner product == cosine)."""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        return embeddings.astype(np.float32, copy=False)
+
     async def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for text."""
         if not self.model:
             await run_in_threadpool(self._load_model)
 
         def _do_encode():
-            return self.model.encode([text])[0]
+            return self._encode([text])[0]
 
         return await run_in_threadpool(_do_encode)
 
@@ -60,7 +82,7 @@ class EmbeddingService:
             await run_in_threadpool(self._load_model)
 
         def _do_encode():
-            return self.model.encode(texts)
+            return self._encode(texts)
 
         return await run_in_threadpool(_do_encode)
 
@@ -73,35 +95,52 @@ class EmbeddingService:
         embeddings = await self.embed_batch(documents)
 
         def _do_build():
-            # Create FAISS index
+            # Embeddings are normalized, so inner product ranks by cosine similarity
             dimension = embeddings.shape[1]
-            index = faiss.IndexFlatL2(dimension)
-            index.add(embeddings.astype("float32"))
+            if len(embeddings) >= HNSW_MIN_DOCUMENTS:
+                index = faiss.IndexHNSWFlat(
+                    dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT
+                )
+                index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            else:
+                index = faiss.IndexFlatIP(dimension)
+            index.add(embeddings)
             return index
 
         self.index = await run_in_threadpool(_do_build)
         logger.info(f"Built index with {len(documents)} documents")
 
     async def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
-        """Search for similar documents."""
+        """Search for similar documents.
+
+        Returns (document, cosine similarity) pairs, most similar first.
+        """
         if not self.index:
             return []
 
         query_embedding = await self.embed_text(query)
 
         def _do_search():
-            q_emb = query_embedding.astype("float32").reshape(1, -1)
-            distances, indices = self.index.search(q_emb, top_k)
-            return distances, indices
+            q_emb = query_embedding.reshape(1, -1)
+            if isinstance(self.index, faiss.IndexHNSWFlat):
+                # Per-call parameters, so concurrent searches don't race on
+                # the shared index.hnsw.efSearch setting
+                params = faiss.SearchParametersHNSW(
+                    efSearch=max(top_k * 4, HNSW_MIN_EF_SEARCH)
+                )
+                return self.index.search(q_emb, top_k, params=params)
+            return self.index.search(q_emb, top_k)
 
         distances, indices = await run_in_threadpool(_do_search)
 
-        results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx < len(self.documents) and idx >= 0:
-                results.append((self.documents[idx], float(distance)))
-
-        return results
+        # faiss pads missing neighbours with -1
+        idxs = indices[0]
+        mask = (idxs >= 0) & (idxs < len(self.documents))
+        documents = self.documents
+        return [
+            (documents[i], score)
+            for i, score in zip(idxs[mask].tolist(), distances[0][mask].tolist())
+        ]
 
     async def load_from_file(self, path: str) -> int:
         """Load documents from a JSON file and build the index.
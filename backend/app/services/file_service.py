@@ -1,32 +1,54 @@
+import hashlib
 import uuid
 from pathlib import Path
+from typing import AsyncIterator
 
 import aiofiles
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+CHUNK_SIZE = 1 << 20  # 1 MiB per read/write when streaming uploads to disk
+
 
 class FileService:
-    async def save_file(self, file: UploadFile) -> dict:
-        """Save an uploaded file and return its metadata."""
+    async def save_file(self, file: UploadFile, digest: bool = False) -> dict:
+        """Save an uploaded file and return its metadata.
+
+        With ``digest``, a BLAKE2b hex digest of the contents is added under
+        ``"digest"``, computed while the chunks are written.
+        """
         file_ext = Path(file.filename).suffix
         file_id = str(uuid.uuid4())
         filename = f"{file_id}{file_ext}"
         file_path = UPLOAD_DIR / filename
 
+        # Stream in chunks so memory stays flat regardless of upload size
+        size = 0
+        hasher = hashlib.blake2b(digest_size=16) if digest else None
         async with aiofiles.open(file_path, 'wb') as out_file:
-            content = await file.read()
-            await out_file.write(content)
+            while chunk := await file.read(CHUNK_SIZE):
+                await out_file.write(chunk)
+                size += len(chunk)
+                if hasher:
+                    hasher.update(chunk)
 
-        return {
+        metadata = {
             "id": file_id,
             "filename": file.filename,
             "path": str(file_path),
             "content_type": file.content_type,
-            "size": len(content)
+            "size": size
         }
+        if hasher:
+            metadata["digest"] = hasher.hexdigest()
+        return metadata
+
+    async def delete_file(self, file_path: str) -> None:
+        """Remove a saved upload if it is still on disk."""
+        await run_in_threadpool(Path(file_path).unlink, missing_ok=True)
 
     async def extract_text(self, file_path: str, content_type: str) -> str:
         """Extract text from a file based on its type."""
@@ -35,7 +57,8 @@ class FileService:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         if content_type == "application/pdf":
-            return self._extract_pdf(path)
+            # CPU-bound parsing; keep it off the event loop
+            return await run_in_threadpool(self._extract_pdf, path)
         elif content_type.startswith("text/"):
             return await self._read_text(path)
         else:
@@ -45,18 +68,21 @@ class FileService:
         try:
             import pypdf
             reader = pypdf.PdfReader(path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            # Join once instead of growing a string page by page
+            return "".join(f"{page.extract_text() or ''}\n" for page in reader.pages)
         except ImportError:
             return "pypdf not installed. Cannot extract PDF text."
         except Exception as e:
             return f"Error extracting PDF: {str(e)}"
 
-    async def _read_text(self, path: Path) -> str:
+    async def _iter_text(self, path: Path) -> AsyncIterator[str]:
+        """Yield decoded text in CHUNK_SIZE pieces (one threadpool hop each)."""
         async with aiofiles.open(path, 'r', encoding='utf-8', errors='ignore') as f:
-            return await f.read()
+            while chunk := await f.read(CHUNK_SIZE):
+                yield chunk
+
+    async def _read_text(self, path: Path) -> str:
+        return "".join([chunk async for chunk in self._iter_text(path)])
 
 
 file_service = FileService()
@@ -1,15 +1,79 @@
 """Image generation service using OpenAI DALL-E API."""
 
-from typing import Optional
+import asyncio
+from functools import lru_cache
+from math import gcd
+from typing import Dict, Optional
 import logging
 import os
 import httpx
+import orjson
 import re
 import random
-from urllib.parse import quote
+from urllib.parse import quote, quote_plus
+
+from ._http import get_http_client
+from ._retry import retry_post
+from ._singleflight import single_flight
+from .cache_service import cache_service
+from .llm_cache import LLM_CACHE_TTL, llm_cache_key
 
 logger = logging.getLogger(__name__)
 
+_URL_RE = re.compile(r"https?://[^\s)]+")
+_IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+ENHANCE_MODEL = "google/gemini-2.0-flash-exp:free"
+ENHANCE_TIMEOUT = 2.0  # Seconds; past this the raw prompt is used
+IMAGE_CACHE_TTL = 604800  # 1 week; Pollinations URLs are stable
+DALLE_CACHE_TTL = 1800  # DALL-E URLs expire after about an hour
+PLACEHOLDER_URL = "https://placehold.co/"  # Fallback images are never cached
+
+# Pollinations style presets, appended to the prompt
+_STYLE_MAP = {
+    'photorealistic': 'photorealistic, highly detailed, 8k',
+    'digital-art': 'digital art, vibrant colors, detailed',
+    'anime': 'anime style, japanese animation, colorful',
+    'oil-painting': 'oil painting, classical art, brushstrokes',
+    '3d-render': '3D render, octane render, volumetric lighting',
+    'watercolor': 'watercolor painting, soft colors, artistic',
+    'minimalist': 'minimalist, clean, simple, modern design'
+}
+
+# Free models served by Pollinations (URL construction only, no API call)
+_POLLINATIONS_MODELS = frozenset({"flux", "flux-realism", "flux-anime", "flux-3d", "turbo"})
+
+# Pollinations model -> (URL suffix, prompt suffix); plain "flux" needs neither
+_MODEL_PARAMS = {
+    "flux-realism": ("&model=flux-realism", ""),
+    "flux-anime": ("&model=flux-anime", ", anime style"),
+    "flux-3d": ("&model=flux-3d", ", 3D render"),
+    "turbo": ("&model=turbo", ""),
+}
+
+
+# Sizes whose OpenRouter ratio isn't the exact reduction (1024x1792 is 4:7)
+_ASPECT_RATIOS = {
+    "1024x1024": "1:1",
+    "1024x1792": "9:16",
+    "1792x1024": "16:9"
+}
+
+
+@lru_cache(maxsize=64)
+def _compute_aspect_ratio(size: str) -> Optional[str]:
+    """Reduce a "WxH" size to its simplest ratio (UI sizes are a small set)."""
+    if size in _ASPECT_RATIOS:
+        return _ASPECT_RATIOS[size]
+    try:
+        w, h = size.lower().split("x")
+        w, h = int(w), int(h)
+        if h == 0:
+            return None
+        g = gcd(w, h)
+        return f"{w // g}:{h // g}"
+    except Exception:
+        return None
+
 
 class ImageService:
     """Service for generating images using AI models."""
@@ -19,6 +83,9 @@ class ImageService:
         self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
         self.use_dalle = bool(self.openai_api_key)
         self.use_openrouter = bool(self.openrouter_api_key)
+        self.enhance_prompt = os.getenv("ENHANCE_PROMPT", "true").lower() != "false"
+        self._rng = random.Random()  # Seeds for Pollinations; not shared module state
+        self._inflight: Dict[str, asyncio.Task] = {}  # Identical concurrent requests
 
     async def generate_image(
         self,
@@ -26,35 +93,91 @@ class ImageService:
         model: str = "flux",
         size: str = "1024x1024",
         quality: str = "standard",
-        style: Optional[str] = None
+        style: Optional[str] = None,
+        force_refresh: bool = False,
     ) -> str:
         """
         Generate an image based on the prompt.
 
+        Identical requests are answered from cache with the same URL while
+        it stays valid (see ``_cache_ttl``); for Pollinations the URL
+        includes the seed, so the same pixels. Concurrent identical
+        requests share a single upstream call.
+
         Args:
             prompt: Text description of the image
             model: Model to use ("flux", "dall-e-3", etc.)
             size: Image size ("1024x1024", "1024x1792", etc.)
             quality: Image quality for DALL-E
             style: Optional artistic style
+            force_refresh: Skip the cache and generate a new image
 
         Returns:
             URL of the generated image
         """
-        # Enhance prompt using Gemini if possible
-        enhanced_prompt = await self._enhance_prompt(prompt)
-        logger.info(f"Generating image with {model}. Original: '{prompt}' -> Enhanced: '{enhanced_prompt[:50]}...'")
+        cache_key = llm_cache_key(
+            "image",
+            model,
+            {"prompt": prompt, "size": size, "quality": quality, "style": style},
+        )
+        if not force_refresh:
+            cached = await cache_service.get(cache_key)
+            if cached:
+                return cached
+
+        async def generate() -> str:
+            image_url = await self._generate(prompt, model, size, quality, style)
+            ttl = self._cache_ttl(model, image_url)
+            if ttl:
+                await cache_service.set(cache_key, image_url, ttl=ttl)
+            return image_url
 
-        # Pollinations (Free Models)
-        if model in ["flux", "flux-realism", "flux-anime", "flux-3d", "turbo"]:
-            return await self._generate_pollinations(enhanced_prompt, model, size, style)
+        return await single_flight(self._inflight, cache_key, generate)
+
+    def _cache_ttl(self, model: str, image_url: str) -> Optional[int]:
+        """How long ``image_url`` may be served from cache, or None to skip.
+
+        Only URLs that outlive the TTL are cached. OpenRouter returns large
+        ``data:`` payloads or links with no known lifetime, so its images
+        are never cached, and neither are placeholders.
+        """
+        if image_url.startswith(("data:", PLACEHOLDER_URL)):
+            return None
+        if model in _POLLINATIONS_MODELS:
+            return IMAGE_CACHE_TTL
+        if model.startswith("dall-e") and self.use_dalle:
+            return DALLE_CACHE_TTL
+        return None
+
+    async def _generate(
+        self,
+        prompt: str,
+        model: str,
+        size: str,
+        quality: str,
+        style: Optional[str],
+    ) -> str:
+        # Pollinations (Free Models): just a URL, not worth an LLM round-trip
+        if model in _POLLINATIONS_MODELS:
+            return await self._generate_pollinations(prompt, model, size, style)
+
+        # Enhance prompt using Gemini if possible
+        enhanced_prompt = prompt
+        if self.enhance_prompt:
+            try:
+                enhanced_prompt = await asyncio.wait_for(
+                    self._enhance_prompt(prompt), timeout=ENHANCE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.info("Prompt enhancement timed out, using original prompt")
+        logger.info("Generating image with %s. Original: '%s' -> Enhanced: '%.50s...'", model, prompt, enhanced_prompt)
 
         # DALL-E
         if model.startswith("dall-e") and self.use_dalle:
             try:
                 return await self._generate_dalle(enhanced_prompt, model, size, quality)
             except Exception as e:
-                logger.error(f"DALL-E generation failed: {e}")
+                logger.error("DALL-E generation failed: %s", e)
                 return self._placeholder_image(prompt)
 
         # OpenRouter
@@ -62,7 +185,7 @@ class ImageService:
             try:
                 return await self._generate_openrouter(enhanced_prompt, model, size)
             except Exception as e:
-                logger.error(f"OpenRouter generation failed with {model}: {e}")
+                logger.error("OpenRouter generation failed with %s: %s", model, e)
                 return self._placeholder_image(prompt)
         else:
             logger.warning("No API key configured, using placeholder")
@@ -73,28 +196,38 @@ class ImageService:
         if not self.use_openrouter:
             return prompt
 
+        # Greedy decoding, so the enhanced prompt is safe to cache
+        payload = {
+            "model": ENHANCE_MODEL,
+            "temperature": 0.0,
+            "messages": [{
+                "role": "user",
+                "content": f"Refine this image prompt to be more descriptive and artistic for an AI image generator. concise, high quality. Prompt: '{prompt}'. Output ONLY the improved prompt text."
+            }]
+        }
+        cache_key = llm_cache_key("enhance", ENHANCE_MODEL, payload)
+        cached = await cache_service.get(cache_key)
+        if cached:
+            return cached
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.openrouter_api_key}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": "https://assistme.app"
-                    },
-                    json={
-                        "model": "google/gemini-2.0-flash-exp:free",
-                        "messages": [{
-                            "role": "user",
-                            "content": f"Refine this image prompt to be more descriptive and artistic for an AI image generator. concise, high quality. Prompt: '{prompt}'. Output ONLY the improved prompt text."
-                        }]
-                    }
-                )
-                if response.status_code == 200:
-                    content = response.json()["choices"][0]["message"]["content"]
-                    return content.strip('" ')
+            response = await get_http_client().post(
+                "https://openrouter.ai/api/v1/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {self.openrouter_api_key}",
+                    "Content-Type": "application/json",
+                    "HTTP-Referer": "https://assistme.app"
+                },
+                content=orjson.dumps(payload),
+                timeout=10.0,
+            )
+            if response.status_code == 200:
+                content = orjson.loads(response.content)["choices"][0]["message"]["content"]
+                enhanced = content.strip('" ')
+                await cache_service.set(cache_key, enhanced, ttl=LLM_CACHE_TTL)
+                return enhanced
         except Exception as e:
-            logger.warning(f"Prompt enhancement failed: {e}")
+            logger.warning("Prompt enhancement failed: %s", e)
 
         return prompt
 
@@ -110,38 +243,20 @@ class ImageService:
 
         # Apply style
         final_prompt = prompt
-        if style and style != 'none':
-            style_map = {
-                'photorealistic': 'photorealistic, highly detailed, 8k',
-                'digital-art': 'digital art, vibrant colors, detailed',
-                'anime': 'anime style, japanese animation, colorful',
-                'oil-painting': 'oil painting, classical art, brushstrokes',
-                '3d-render': '3D render, octane render, volumetric lighting',
-                'watercolor': 'watercolor painting, soft colors, artistic',
-                'minimalist': 'minimalist, clean, simple, modern design'
-            }
-            if style in style_map:
-                final_prompt = f"{prompt}, {style_map[style]}"
+        style_suffix = _STYLE_MAP.get(style)
+        if style_suffix:
+            final_prompt = f"{prompt}, {style_suffix}"
 
         # Model specific params
-        url_suffix = ""
-        if model == "flux-realism":
-            url_suffix = "&model=flux-realism"
-        elif model == "flux-anime":
-            url_suffix = "&model=flux-anime"
-            final_prompt += ", anime style"
-        elif model == "flux-3d":
-            url_suffix = "&model=flux-3d"
-            final_prompt += ", 3D render"
-        elif model == "turbo":
-            url_suffix = "&model=turbo"
+        url_suffix, prompt_suffix = _MODEL_PARAMS.get(model, ("", ""))
+        final_prompt += prompt_suffix
 
         encoded = quote(final_prompt)
-        seed = random.randint(0, 1000000)
+        seed = self._rng.getrandbits(20)
 
         image_url = f"https://image.pollinations.ai/prompt/{encoded}?width={width}&height={height}&seed={seed}&nologo=true{url_suffix}"
 
-        logger.info(f"Generated Pollinations URL: {image_url}")
+        logger.info("Generated Pollinations URL: %s", image_url)
         return image_url
 
     async def _generate_dalle(
@@ -152,31 +267,35 @@ class ImageService:
         quality: str
     ) -> str:
         """Generate image using OpenAI DALL-E API."""
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/images/generations",
-                headers={
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "n": 1,
-                    "size": size,
-                    "quality": quality if model == "dall-e-3" else "standard",
-                    "response_format": "url"
-                }
-            )
-
-            if response.status_code != 200:
-                error_data = response.json()
-                raise Exception(f"DALL-E API error: {error_data}")
-
-            data = response.json()
-            image_url = data["data"][0]["url"]
-            logger.info(f"Image generated successfully: {image_url}")
-            return image_url
+        # Generation itself can take most of a minute and is billed, so a
+        # slow call is never retried; only failed connects and 429/5xx are
+        response = await retry_post(
+            get_http_client(),
+            "https://api.openai.com/v1/images/generations",
+            timeouts=(60.0, 60.0),
+            retry_timeouts=False,
+            headers={
+                "Authorization": f"Bearer {self.openai_api_key}",
+                "Content-Type": "application/json"
+            },
+            content=orjson.dumps({
+                "model": model,
+                "prompt": prompt,
+                "n": 1,
+                "size": size,
+                "quality": quality if model == "dall-e-3" else "standard",
+                "response_format": "url"
+            }),
+        )
+
+        if response.status_code != 200:
+            error_data = orjson.loads(response.content)
+            raise Exception(f"DALL-E API error: {error_data}")
+
+        data = orjson.loads(response.content)
+        image_url = data["data"][0]["url"]
+        logger.info("Image generated successfully: %s", image_url)
+        return image_url
 
     async def _generate_openrouter(
         self,
@@ -185,7 +304,7 @@ class ImageService:
         size: str
     ) -> str:
         """Generate image using OpenRouter API via chat/completions."""
-        logger.info(f"Attempting OpenRouter image generation with model: {model}")
+        logger.info("Attempting OpenRouter image generation with model: %s", model)
         payload = {
             "model": model,
             "messages": [
@@ -204,59 +323,44 @@ class ImageService:
         if aspect_ratio:
             payload["image_config"] = {"aspect_ratio": aspect_ratio}
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.openrouter_api_key}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": "https://assistme.app",
-                        "X-Title": "AssistMe Virtual Assistant"
-                    },
-                    json=payload
-                )
+        try:
+            response = await retry_post(
+                get_http_client(),
+                "https://openrouter.ai/api/v1/chat/completions",
+                timeouts=(60.0, 60.0),
+                retry_timeouts=False,  # Billed generation, see _generate_dalle
+                headers={
+                    "Authorization": f"Bearer {self.openrouter_api_key}",
+                    "Content-Type": "application/json",
+                    "HTTP-Referer": "https://assistme.app",
+                    "X-Title": "AssistMe Virtual Assistant"
+                },
+                content=orjson.dumps(payload),
+            )
 
-                logger.info(f"OpenRouter response status: {response.status_code}")
+            logger.info("OpenRouter response status: %s", response.status_code)
 
-                if response.status_code != 200:
-                    error_text = response.text
-                    logger.error(f"OpenRouter API error ({response.status_code}): {error_text}")
-                    raise Exception(f"OpenRouter returned {response.status_code}: {error_text}")
+            if response.status_code != 200:
+                error_text = response.text
+                logger.error("OpenRouter API error (%s): %s", response.status_code, error_text)
+                raise Exception(f"OpenRouter returned {response.status_code}: {error_text}")
 
-                data = response.json()
-                image_url = self._extract_image_from_openrouter(data)
-                if image_url:
-                    logger.info("Image URL extracted from OpenRouter response")
-                    return image_url
+            data = orjson.loads(response.content)
+            image_url = self._extract_image_from_openrouter(data)
+            if image_url:
+                logger.info("Image URL extracted from OpenRouter response")
+                return image_url
 
-                logger.error(f"No image data found in OpenRouter response: {data}")
-                raise Exception("No image data found in response")
+            logger.error("No image data found in OpenRouter response: %s", data)
+            raise Exception("No image data found in response")
 
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP error during OpenRouter request: {e}")
-                raise Exception(f"Network error: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("HTTP error during OpenRouter request: %s", e)
+            raise Exception(f"Network error: {str(e)}")
 
     def _aspect_ratio_from_size(self, size: str) -> Optional[str]:
         """Translate size strings to OpenRouter image_config aspect ratios."""
-        size_map = {
-            "1024x1024": "1:1",
-            "1024x1792": "9:16",
-            "1792x1024": "16:9"
-        }
-        if size in size_map:
-            return size_map[size]
-        try:
-            w, h = size.lower().split("x")
-            w, h = int(w), int(h)
-            if h == 0:
-                return None
-            # Reduce ratio to simplest form
-            from math import gcd
-            g = gcd(w, h)
-            return f"{w // g}:{h // g}"
-        except Exception:
-            return None
+        return _compute_aspect_ratio(size)
 
     def _extract_image_from_openrouter(self, data: dict) -> Optional[str]:
         """Handle the various image response shapes from OpenRouter (Gemini/SD/Flux)."""
@@ -313,17 +417,19 @@ class ImageService:
 
     def _extract_url_from_text(self, text: str) -> Optional[str]:
         """Find the first plausible image URL in freeform text."""
-        matches = re.findall(r'(https?://[^\s)]+)', text or "")
-        for url in matches:
-            if any(url.lower().endswith(ext) for ext in [".png", ".jpg", ".jpeg", ".webp"]):
+        first = None
+        for match in _URL_RE.finditer(text or ""):
+            url = match.group(0)
+            if url.lower().endswith(_IMAGE_EXTS):
                 return url
-        return matches[0] if matches else None
+            first = first or url
+        return first
 
     def _placeholder_image(self, prompt: str) -> str:
         """Return a placeholder image URL."""
-        # Use a better placeholder service
-        safe_prompt = prompt[:50].replace(" ", "+")
-        return f"https://placehold.co/1024x1024/4A90E2/FFF?text={safe_prompt}"
+        # Use a better placeholder service; encode &, #, ? etc. too
+        safe_prompt = quote_plus(prompt[:50])
+        return f"{PLACEHOLDER_URL}1024x1024/4A90E2/FFF?text={safe_prompt}"
 
 
 # Global instance
@@ -34,7 +34,7 @@ class IndicLLMService:
         Generate response in specific Indian language
 
         Args:
-            messages: Chat history
+            messages: Chat history (any system message must come first)
             language: Target language code (e.g., 'hi', 'ta')
             model: Optional specific model to use
             temperature: Creativity
@@ -49,15 +49,15 @@ class IndicLLMService:
         if not model:
             model = "meta-llama/llama-3.3-70b-instruct:free"
 
-        # Add system prompt for language enforcement if not present
-        system_prompt = (
-            f"You are a helpful assistant. Please answer in {language} language."
-        )
-
-        # Check if system message exists
-        has_system = any(m.get("role") == "system" for m in messages)
-        if not has_system:
-            messages.insert(0, {"role": "system", "content": system_prompt})
+        # Add system prompt for language enforcement if not present. By
+        # convention a system message can only lead the list, so checking
+        # the first entry is enough. Build a new list rather than inserting,
+        # so the caller's list is untouched.
+        if not (messages and messages[0].get("role") == "system"):
+            system_prompt = (
+                f"You are a helpful assistant. Please answer in {language} language."
+            )
+            messages = [{"role": "system", "content": system_prompt}, *messages]
 
         return await self.provider.chat_completion(
             messages=messages,
@@ -0,0 +1,26 @@
+"""Exact-match cache keys for LLM text responses.
+
+Repeated prompts (UI presets, greetings, retries) are answered from
+``cache_service`` instead of another round-trip to the model. Keys hash
+the full request payload, so any change to messages or generation
+settings is a miss.
+
+Only cache deterministic (temperature 0) calls: a reply sampled at a
+higher temperature is one draw of many, and replaying it for a day would
+make every repeat of the turn identical.
+"""
+
+import hashlib
+from typing import Any
+
+import orjson
+
+LLM_CACHE_TTL = 86400  # 1 day
+
+
+def llm_cache_key(namespace: str, model: str, payload: Any) -> str:
+    """Build a stable cache key for an LLM request payload."""
+    digest = hashlib.sha256(
+        orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+    return f"llm:v1:{namespace}:{model}:{digest}"
@@ -12,6 +12,94 @@ from typing import Dict, Optional
 logger = logging.getLogger(__name__)
 
 
+class _WindowCounter:
+    """Sliding-window request count kept in a ring of fixed-width buckets.
+
+    Expired buckets are zeroed as time advances, so counting and recording
+    are O(1) amortized however many requests are in the window. The window
+    is accurate to one bucket width.
+    """
+
+    def __init__(self, buckets: int, resolution: float):
+        self._counts = [0] * buckets
+        self._resolution = resolution
+        self._tick = 0
+        self.total = 0
+
+    def _advance(self, now: float) -> int:
+        tick = int(now // self._resolution)
+        elapsed = tick - self._tick
+        if elapsed > 0:
+            size = len(self._counts)
+            if elapsed >= size:
+                self._counts[:] = [0] * size
+                self.total = 0
+            else:
+                for t in range(self._tick + 1, tick + 1):
+                    slot = t % size
+                    self.total -= self._counts[slot]
+                    self._counts[slot] = 0
+            self._tick = tick
+        return self._tick % len(self._counts)
+
+    def count(self, now: float) -> int:
+        self._advance(now)
+        return self.total
+
+    def add(self, now: float) -> int:
+        """Count one request; returns its tick for a later discard()."""
+        slot = self._advance(now)
+        self._counts[slot] += 1
+        self.total += 1
+        return self._tick
+
+    def discard(self, tick: int) -> None:
+        """Undo an add() from ``tick`` if it is still inside the window."""
+        if self._tick - tick < len(self._counts):
+            self._counts[tick % len(self._counts)] -= 1
+            self.total -= 1
+
+
+class Reservation:
+    """A rate-limit slot and estimated credits held for one request.
+
+    Call ``commit`` with the real token count once the model call is done,
+    or ``release`` if no model call is made. Neither awaits, so each runs
+    atomically on the event loop without taking the service lock.
+    """
+
+    def __init__(self, service: "RateLimitService", model: str, cost: float,
+                 minute_tick: int, hour_tick: int):
+        self._service = service
+        self.model = model
+        self._cost = cost
+        self._minute_tick = minute_tick
+        self._hour_tick = hour_tick
+        self._done = False
+
+    def commit(self, tokens_used: int = 0) -> None:
+        """Settle credits against actual usage."""
+        if self._done:
+            return
+        self._done = True
+        service = self._service
+        cost = service._cost(self.model, tokens_used)
+        service.current_credits -= cost - self._cost
+        logger.info(
+            "Request recorded: %s, tokens: %s, cost: $%.6f, credits remaining: $%.4f",
+            self.model, tokens_used, cost, service.current_credits)
+
+    def release(self) -> None:
+        """Give back the slot and the estimated credits."""
+        if self._done:
+            return
+        self._done = True
+        service = self._service
+        service.minute_requests.discard(self._minute_tick)
+        service.hour_requests.discard(self._hour_tick)
+        service.current_credits += self._cost
+
+
 class RateLimitService:
     def __init__(self):
         # Rate limits (requests per minute)
@@ -22,9 +110,9 @@ class RateLimitService:
         self.max_credits = float(os.getenv("MAX_CREDITS", "10.0"))
         self.current_credits = self.max_credits
 
-        # Tracking
-        self.minute_requests = []
-        self.hour_requests = []
+        # Tracking: 60 one-second buckets for RPM, 60 one-minute buckets for RPH
+        self.minute_requests = _WindowCounter(60, 1.0)
+        self.hour_requests = _WindowCounter(60, 60.0)
         self.lock = asyncio.Lock()
 
         # Cost tracking per model (approximate costs) – OpenRouter-only
@@ -38,30 +126,64 @@ class RateLimitService:
         }
 
         logger.info(
-            f"Rate limit service initialized: {self.requests_per_minute} RPM, {self.requests_per_hour} RPH, ${self.max_credits} credits")
+            "Rate limit service initialized: %s RPM, %s RPH, $%s credits",
+            self.requests_per_minute, self.requests_per_hour, self.max_credits)
 
     async def check_rate_limit(self) -> tuple[bool, str]:
         """Check if request is within rate limits."""
         async with self.lock:
-            now = time.time()
-
-            # Clean old requests
-            self.minute_requests = [t for t in self.minute_requests if now - t < 60]
-            self.hour_requests = [t for t in self.hour_requests if now - t < 3600]
+            now = time.monotonic()
 
             # Check rate limits
-            if len(self.minute_requests) >= self.requests_per_minute:
+            if self.minute_requests.count(now) >= self.requests_per_minute:
                 return False, f"Rate limit exceeded: {self.requests_per_minute} requests per minute"
 
-            if len(self.hour_requests) >= self.requests_per_hour:
+            if self.hour_requests.count(now) >= self.requests_per_hour:
                 return False, f"Rate limit exceeded: {self.requests_per_hour} requests per hour"
 
             return True, ""
 
+    def _cost(self, model: str, tokens: int) -> float:
+        cost_per_token = self.model_costs.get(model, 0.0001)  # Default small cost
+        return cost_per_token * (tokens / 1000)
+
+    async def reserve(
+        self, model: str, estimated_tokens: int = 1000
+    ) -> tuple[Optional[Reservation], int, str]:
+        """Check limits and claim a slot in one step.
+
+        Checking and recording under a single lock acquisition closes the
+        window where concurrent requests all pass the check before any of
+        them is recorded.
+
+        Returns:
+            (reservation, 0, "") on success, otherwise (None, status, reason)
+            with status 429 for rate limits and 402 for credits.
+        """
+        async with self.lock:
+            now = time.monotonic()
+            if self.minute_requests.count(now) >= self.requests_per_minute:
+                return None, 429, f"Rate limit exceeded: {self.requests_per_minute} requests per minute"
+
+            if self.hour_requests.count(now) >= self.requests_per_hour:
+                return None, 429, f"Rate limit exceeded: {self.requests_per_hour} requests per hour"
+
+            estimated_cost = self._cost(model, estimated_tokens)
+            if self.current_credits - estimated_cost < 0:
+                return None, 402, f"Insufficient credits. Current: ${self.current_credits:.4f}, Required: ${estimated_cost:.4f}"
+
+            self.current_credits -= estimated_cost
+            return Reservation(
+                self,
+                model,
+                estimated_cost,
+                self.minute_requests.add(now),
+                self.hour_requests.add(now),
+            ), 0, ""
+
     async def check_credits(self, model: str, estimated_tokens: int = 1000) -> tuple[bool, str]:
         """Check if request would exceed credit limits."""
-        cost_per_token = self.model_costs.get(model, 0.0001)  # Default small cost
-        estimated_cost = cost_per_token * (estimated_tokens / 1000)
+        estimated_cost = self._cost(model, estimated_tokens)
 
         if self.current_credits - estimated_cost < 0:
             return False, f"Insufficient credits. Current: ${self.current_credits:.4f}, Required: ${estimated_cost:.4f}"
@@ -71,26 +193,24 @@ class RateLimitService:
     async def record_request(self, model: str, tokens_used: int = 0):
         """Record a completed request for rate limiting."""
         async with self.lock:
-            now = time.time()
-            self.minute_requests.append(now)
-            self.hour_requests.append(now)
+            now = time.monotonic()
+            self.minute_requests.add(now)
+            self.hour_requests.add(now)
 
             # Deduct credits
-            cost_per_token = self.model_costs.get(model, 0.0001)
-            cost = cost_per_token * (tokens_used / 1000)
+            cost = self._cost(model, tokens_used)
             self.current_credits -= cost
 
             logger.info(
-                f"Request recorded: {model}, tokens: {tokens_used}, cost: ${cost:.6f}, credits remaining: ${self.current_credits:.4f}")
+                "Request recorded: %s, tokens: %s, cost: $%.6f, credits remaining: $%.4f",
+                model, tokens_used, cost, self.current_credits)
 
     async def get_status(self) -> Dict:
         """Get current rate limit and credit status."""
         async with self.lock:
-            now = time.time()
-
-            # Clean old requests for accurate counts
-            current_minute_requests = len([t for t in self.minute_requests if now - t < 60])
-            current_hour_requests = len([t for t in self.hour_requests if now - t < 3600])
+            now = time.monotonic()
+            current_minute_requests = self.minute_requests.count(now)
+            current_hour_requests = self.hour_requests.count(now)
 
             return {
                 "requests_this_minute": current_minute_requests,
@@ -105,7 +225,7 @@ class RateLimitService:
     def reset_credits(self, amount: Optional[float] = None):
         """Reset credits (for testing or manual adjustment)."""
         self.current_credits = amount if amount is not None else self.max_credits
-        logger.info(f"Credits reset to ${self.current_credits}")
+        logger.info("Credits reset to $%s", self.current_credits)
 
 
 # Global instance
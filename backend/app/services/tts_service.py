@@ -23,15 +23,151 @@ Models:
 Reference: https://ai.google.dev/gemini-api/docs/speech-generation
 """
 
+import asyncio
+import base64
+import functools
 import logging
 import os
 import re
-from typing import Dict, List, Optional
+from collections import Counter, deque
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
-import httpx
+import orjson
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from ._http import JSON_HEADERS, get_http_client
+from ._retry import retry_post
+from ._singleflight import single_flight
+from .llm_cache import llm_cache_key
 
 logger = logging.getLogger(__name__)
 
+# normalize_for_tts patterns, compiled once at import
+_ABBREVIATIONS = {
+    'Dr.': 'Doctor',
+    'Mr.': 'Mister',
+    'Mrs.': 'Misses',
+    'Ms.': 'Miss',
+    'Jr.': 'Junior',
+    'Sr.': 'Senior',
+    'vs.': 'versus',
+    'etc.': 'etcetera',
+    'e.g.': 'for example',
+    'i.e.': 'that is',
+    'approx.': 'approximately',
+}
+# Word-anchored so "Dr." inside e.g. "HDr." is left alone
+_ABBREV_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(_ABBREVIATIONS, key=len, reverse=True))) + ')'
+)
+_PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_URL_RE = re.compile(r'https?://[^\s]+')
+_EMAIL_RE = re.compile(r'[\w.-]+@[\w.-]+\.\w+')
+_COLON_RE = re.compile(r':(?!\s)')
+# Markdown stays as separate passes: a bold span can contain code, and a
+# single alternation would not rescan inside the replaced span
+_BOLD_RE = re.compile(r'\*{1,2}([^*]+)\*{1,2}')
+_CODE_RE = re.compile(r'`([^`]+)`')
+_HEADER_RE = re.compile(r'#{1,6}\s+')
+# Single-pass character rewrites for phone and email matches
+_PHONE_STRIP = str.maketrans('', '', '-.() ')
+_EMAIL_SPEAK = str.maketrans({'@': ' at ', '.': ' dot '})
+
+
+def _expand_abbrev(match: re.Match) -> str:
+    return _ABBREVIATIONS[match.group()]
+
+
+def _phone_to_digits(match: re.Match) -> str:
+    """Spell a phone number digit by digit."""
+    return ' '.join(match.group().translate(_PHONE_STRIP))
+
+
+def _speak_email(match: re.Match) -> str:
+    """Read "a.b@c.com" as "a dot b at c dot com"."""
+    return match.group().translate(_EMAIL_SPEAK)
+
+
+def _strip_markdown(text: str) -> str:
+    """Unwrap bold/italic and inline code, drop header markers."""
+    if '*' in text:
+        text = _BOLD_RE.sub(r'\1', text)
+    if '`' in text:
+        text = _CODE_RE.sub(r'\1', text)
+    if '#' in text:
+        text = _HEADER_RE.sub('', text)
+    return text
+
+
+def _collapse_punct(text: str) -> str:
+    """Shorten runs of 4+ dots to "...", and of "!" / "?" to one.
+
+    Plain substring checks: almost every text has no runs, and each check
+    is a single C-level scan with no regex engine setup.
+    """
+    while '....' in text:
+        text = text.replace('....', '...')
+    while '!!' in text:
+        text = text.replace('!!', '!')
+    while '??' in text:
+        text = text.replace('??', '?')
+    return text
+
+
+# Emergency keyword -> fixed script, in priority order
+_EMERGENCY_SCRIPTS = {
+    'emergency': "Please contact emergency services immediately. Call 911 or your local emergency number.",
+    'suicide': "If you're in crisis, please contact a crisis helpline. You're not alone.",
+    'heart attack': "Call emergency services immediately. Sit down and stay calm.",
+    'fire': "Leave the building immediately and call emergency services.",
+}
+# Whole words only ("fire" but not "firearm" or "bonfire"). No keyword
+# contains another, so non-overlapping matches find them all
+_EMERGENCY_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, _EMERGENCY_SCRIPTS)) + r')\b', re.IGNORECASE
+)
+
+# Input bounds so one oversized request can't cost unbounded CPU
+MAX_TTS_CHARS = 5000  # Same limit as the /api/tts request model
+MAX_HISTORY_CHARS = 8000
+
+
+def _cap_text(text: str, what: str) -> str:
+    if len(text) > MAX_TTS_CHARS:
+        logger.warning("Truncated %s from %d to %d chars", what, len(text), MAX_TTS_CHARS)
+        return text[:MAX_TTS_CHARS]
+    return text
+
+
+# Longer texts bypass the cache so one-off LLM replies don't pin memory
+_TEXT_CACHE_MAX_LEN = 4096
+
+
+def _short_text_cache(func):
+    """lru_cache keyed on a trailing text argument, for short texts only.
+
+    Canned scripts (emergency, clarification, fallback) and repeated
+    phrases skip the regex/keyword work on a hit.
+    """
+    cached = functools.lru_cache(maxsize=1024)(func)
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        if len(args[-1] or '') > _TEXT_CACHE_MAX_LEN:
+            return func(*args)
+        return cached(*args)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
 
 class TextNormalizer:
     """Normalize text for TTS - critical for voice quality."""
@@ -44,68 +180,70 @@ class TextNormalizer:
     }
 
     @staticmethod
+    @_short_text_cache
     def normalize_for_tts(text: str) -> str:
         """Normalize text for natural TTS output."""
         if not text:
             return text
+        text = _cap_text(text, "TTS text")
 
-        # 1. Replace common abbreviations
-        abbrevs = {
-            'Dr.': 'Doctor',
-            'Mr.': 'Mister',
-            'Mrs.': 'Misses',
-            'Ms.': 'Miss',
-            'Jr.': 'Junior',
-            'Sr.': 'Senior',
-            'vs.': 'versus',
-            'etc.': 'etcetera',
-            'e.g.': 'for example',
-            'i.e.': 'that is',
-            'approx.': 'approximately',
-        }
-        for abbrev, full in abbrevs.items():
-            text = text.replace(abbrev, full)
+        # Each pass below is skipped when its marker character is absent,
+        # which for voice-prompt LLM output is most of them
+
+        # 1. Replace common abbreviations (one scan for all of them)
+        if '.' in text:
+            text = _ABBREV_RE.sub(_expand_abbrev, text)
 
         # 2. Handle phone numbers (read digit by digit)
-        def phone_to_digits(match):
-            number = match.group()
-            return ' '.join(number.replace('-', '').replace('(', '').replace(')', '').replace(' ', ''))
-        text = re.sub(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', phone_to_digits, text)
+        text = _PHONE_RE.sub(_phone_to_digits, text)
 
         # 3. Handle URLs (just say "link" or domain)
-        text = re.sub(r'https?://[^\s]+', 'link', text)
+        if '://' in text:
+            text = _URL_RE.sub('link', text)
 
         # 4. Handle email addresses
-        text = re.sub(r'[\w.-]+@[\w.-]+\.\w+', lambda m: m.group().replace('@', ' at ').replace('.', ' dot '), text)
+        if '@' in text:
+            text = _EMAIL_RE.sub(_speak_email, text)
 
         # 5. Add prosody hints (commas for pauses)
         # Add pause after colons
-        text = re.sub(r':(?!\s)', ': ', text)
+        if ':' in text:
+            text = _COLON_RE.sub(': ', text)
 
         # 6. Clean up excessive punctuation
-        text = re.sub(r'\.{3,}', '...', text)
-        text = re.sub(r'!{2,}', '!', text)
-        text = re.sub(r'\?{2,}', '?', text)
+        text = _collapse_punct(text)
 
         # 7. Remove markdown
-        text = re.sub(r'\*{1,2}([^*]+)\*{1,2}', r'\1', text)  # Bold/italic
-        text = re.sub(r'`([^`]+)`', r'\1', text)  # Code
-        text = re.sub(r'#{1,6}\s+', '', text)  # Headers
+        text = _strip_markdown(text)
+
+        return text.strip()
 
+    @staticmethod
+    @_short_text_cache
+    def normalize_llm_output(text: str) -> str:
+        """Light normalization for replies from the voice-optimized prompt.
+
+        The prompt already rules out numbers, links and formatting, so only
+        stray markdown and punctuation runs are cleaned up; raw user text
+        should go through normalize_for_tts.
+        """
+        if not text:
+            return text
+        text = _cap_text(text, "LLM reply")
+        text = _collapse_punct(text)
+        text = _strip_markdown(text)
         return text.strip()
 
     @staticmethod
+    @_short_text_cache
     def normalize_for_emergency(text: str) -> Optional[str]:
         """Check for emergency keywords and return fixed script."""
-        emergency_keywords = {
-            'emergency': "Please contact emergency services immediately. Call 911 or your local emergency number.",
-            'suicide': "If you're in crisis, please contact a crisis helpline. You're not alone.",
-            'heart attack': "Call emergency services immediately. Sit down and stay calm.",
-            'fire': "Leave the building immediately and call emergency services.",
-        }
-        text_lower = text.lower()
-        for keyword, response in emergency_keywords.items():
-            if keyword in text_lower:
+        found = {match.lower() for match in _EMERGENCY_RE.findall(text)}
+        if not found:
+            return None
+        # Several keywords: the first in _EMERGENCY_SCRIPTS order wins
+        for keyword, response in _EMERGENCY_SCRIPTS.items():
+            if keyword in found:
                 return response
         return None
 
@@ -156,22 +294,33 @@ class EmotionDetector:
     @classmethod
     def detect_emotion(cls, text: str) -> str:
         """Detect the primary emotion in text."""
-        text_lower = text.lower()
+        # The style only needs a representative sample of long texts
+        text_lower = text[:MAX_TTS_CHARS].lower()
 
-        # Check for paralinguistic tags first
-        for tag in cls.PARALINGUISTIC_TAGS:
-            if tag in text_lower:
-                return tag
+        # One automaton pass finds tags and emotion keywords together
+        if _KEYWORD_AUTOMATON is not None:
+            matched = {word for _, word in _KEYWORD_AUTOMATON.iter(text_lower)}
+            tags = [tag for tag in cls.PARALINGUISTIC_TAGS if tag in matched]
+        else:
+            tags = [tag for tag in cls.PARALINGUISTIC_TAGS if tag in text_lower]
+            matched = None if tags else {kw for kw in _KEYWORD_EMOTIONS if kw in text_lower}
 
-        # Count emotion keyword matches
-        emotion_scores = {}
-        for emotion, keywords in cls.EMOTION_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            if score > 0:
-                emotion_scores[emotion] = score
+        # Paralinguistic tags take precedence over keyword scoring
+        if tags:
+            return tags[0]
+
+        # Score each emotion by how many of its keywords appear
+        emotion_scores = Counter(
+            emotion for kw in matched if kw in _KEYWORD_EMOTIONS
+            for emotion in _KEYWORD_EMOTIONS[kw]
+        )
 
         if emotion_scores:
-            return max(emotion_scores, key=emotion_scores.get)
+            # Ties go to the emotion listed first in EMOTION_KEYWORDS
+            best = max(emotion_scores.values())
+            for emotion in cls.EMOTION_KEYWORDS:
+                if emotion_scores[emotion] == best:
+                    return emotion
 
         return "neutral"
 
@@ -183,20 +332,129 @@ class EmotionDetector:
         return cls.EMOTION_STYLES.get(emotion, cls.EMOTION_STYLES["neutral"])
 
     @classmethod
+    @_short_text_cache
     def process_text_with_emotion(cls, text: str) -> tuple:
         """Process text and return (cleaned_text, style_prompt, emotion)."""
         emotion = cls.detect_emotion(text)
         style_prompt = cls.get_style_prompt(emotion)
 
-        # Remove paralinguistic tags from text
-        cleaned_text = text
-        for tag in cls.PARALINGUISTIC_TAGS:
-            cleaned_text = cleaned_text.replace(tag, "")
-        cleaned_text = cleaned_text.strip()
+        # Remove paralinguistic tags from text (one scan for all tags)
+        cleaned_text = _PARALINGUISTIC_RE.sub("", text).strip()
 
         return cleaned_text, style_prompt, emotion
 
 
+_PARALINGUISTIC_RE = re.compile(
+    '|'.join(map(re.escape, EmotionDetector.PARALINGUISTIC_TAGS))
+)
+
+# Keyword -> emotions it counts towards ("amazing" is both happy and surprised)
+_KEYWORD_EMOTIONS: Dict[str, tuple] = {}
+for _emotion, _keywords in EmotionDetector.EMOTION_KEYWORDS.items():
+    for _kw in _keywords:
+        _KEYWORD_EMOTIONS[_kw] = _KEYWORD_EMOTIONS.get(_kw, ()) + (_emotion,)
+
+
+def _build_keyword_automaton():
+    """Aho-Corasick automaton over emotion keywords and paralinguistic tags.
+
+    One O(n) pass per text replaces a substring search per keyword.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in (*_KEYWORD_EMOTIONS, *EmotionDetector.PARALINGUISTIC_TAGS):
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only deep copy: mappings become MappingProxyType, lists tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@functools.lru_cache(maxsize=64)
+def _generation_config(voice: str) -> Dict:
+    """Static audio generationConfig for a voice (shared, never mutated)."""
+    return {
+        "responseModalities": ["AUDIO"],
+        "speechConfig": {
+            "voiceConfig": {
+                "prebuiltVoiceConfig": {
+                    "voiceName": voice
+                }
+            }
+        }
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _voice_system_prompt(language: str, detected_input_lang: Optional[str]) -> str:
+    """Voice-assistant system prompt; only the language lines vary per turn."""
+    return f"""You are AssistMe, a professional AI voice assistant.
+
+═══════════════════════════════════════════════════════════════
+VOICE OUTPUT REQUIREMENTS (STRICTLY FOLLOW - 90% adherence expected)
+═══════════════════════════════════════════════════════════════
+
+RESPONSE FORMAT:
+• Keep responses to 2-3 sentences MAXIMUM
+• Never exceed 50 words total
+• End with a clear, complete thought
+
+FORBIDDEN (NEVER USE):
+✗ Markdown (no **, ##, ```, etc.)
+✗ Lists, bullet points, or numbered items
+✗ Emojis or special characters
+✗ Code blocks or technical formatting
+✗ Multiple paragraphs
+
+SPEECH OPTIMIZATION:
+• Spell out numbers (say "twenty-five" not "25")
+• Use commas for natural pauses
+• Use periods for longer pauses
+• Vary sentence length for rhythm
+• End statements confidently
+
+LANGUAGE: {language}
+{f"(User spoke in: {detected_input_lang})" if detected_input_lang else ""}
+
+PERSONALITY:
+• Warm and friendly but professional
+• Concise and helpful
+• Sound natural when spoken aloud
+• Never apologize excessively
+
+Remember: Your response will be spoken aloud by Gemini TTS."""
+
+
+# Streamed voice replies are voiced in pieces: the first as soon as a
+# sentence ends past 120 chars, later ones in larger runs so fewer TTS
+# calls split the prosody
+_FIRST_CHUNK_MIN_CHARS = 120
+_NEXT_CHUNK_MIN_CHARS = 500
+_SENTENCE_END_RE = re.compile(r'[.!?](?=\s)')
+
+
+async def _iter_sse_parts(response) -> AsyncIterator[Dict]:
+    """Content parts from a Gemini ``streamGenerateContent?alt=sse`` response."""
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = orjson.loads(line[5:])
+        for candidate in data.get("candidates", []):
+            for part in candidate.get("content", {}).get("parts", []):
+                yield part
+
+
 class GeminiVoiceService:
     """Production-grade Gemini 2.5 Flash Native Audio Service.
 
@@ -245,6 +503,7 @@ class GeminiVoiceService:
         "Polyhymnia", "Terpsichore", "Thalia", "Urania", "Algieba",
         "Altair", "Ananke", "Autonoe", "Callirrhoe", "Carpo", "Dione", "Gacrux"
     ]
+    VOICE_SET = frozenset(ALL_VOICES)  # Hashed lookup for per-request validation
 
     # Supported languages with full metadata
     # Gemini TTS supports 24 languages including 6 Indian languages
@@ -285,12 +544,40 @@ class GeminiVoiceService:
 
     # Indian languages list for quick access
     INDIAN_LANGUAGES = ["hi-IN", "bn-BD", "mr-IN", "ta-IN", "te-IN", "en-IN"]
+    INDIAN_LANGUAGE_SET = frozenset(INDIAN_LANGUAGES)
+
+    # Metadata getter results, built once and read-only so no caller can
+    # change what the next one sees
+    VOICES_INFO = _freeze({
+        "grouped": VOICES,
+        "all": ALL_VOICES,
+        "count": len(ALL_VOICES)
+    })
+    INDIAN_LANGUAGES_INFO = _freeze(
+        dict(zip(INDIAN_LANGUAGES, map(LANGUAGES.__getitem__, INDIAN_LANGUAGES)))
+    )
+    LANGUAGES_INFO = _freeze({
+        "languages": LANGUAGES,
+        "indian": INDIAN_LANGUAGES_INFO,
+        "codes": list(LANGUAGES),
+        "count": len(LANGUAGES)
+    })
 
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY", "").strip()
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
         self.normalizer = TextNormalizer()
 
+        # Endpoint URLs are fixed for the process; build them once
+        models = f"{self.base_url}/models"
+        self._tts_url = f"{models}/{self.TTS_MODEL}:generateContent?key={self.api_key}"
+        self._tts_stream_url = f"{models}/{self.TTS_MODEL}:streamGenerateContent?alt=sse&key={self.api_key}"
+        self._llm_url = f"{models}/{self.LLM_MODEL}:generateContent?key={self.api_key}"
+        self._llm_stream_url = f"{models}/{self.LLM_MODEL}:streamGenerateContent?alt=sse&key={self.api_key}"
+
+        self._inflight: Dict[str, asyncio.Task] = {}  # Identical concurrent TTS requests
+        self._fixed_audio: Dict[Tuple[str, str, str], Dict] = {}  # Guardrail script audio
+
         if not self.api_key:
             logger.warning("GOOGLE_API_KEY not set - Gemini TTS will not work")
 
@@ -300,6 +587,7 @@ class GeminiVoiceService:
         voice: str = "Puck",
         style: Optional[str] = None,
         auto_emotion: bool = True,
+        skip_normalize: bool = False,
     ) -> Dict:
         """Convert text to speech using Gemini 2.5 Flash TTS.
 
@@ -313,19 +601,86 @@ class GeminiVoiceService:
             voice: Voice name from 30 available options
             style: Speaking style hint (overrides auto-detection)
             auto_emotion: Auto-detect emotion if style not specified
+            skip_normalize: Text was already normalized by the caller
 
         Returns:
             Dict with base64 WAV audio data and emotion info
         """
+        selected_voice, payload = self._build_tts_payload(
+            text, voice, style, auto_emotion, skip_normalize
+        )
+        key = llm_cache_key("tts", self.TTS_MODEL, payload)
+        return await single_flight(
+            self._inflight, key, lambda: self._synthesize(payload, selected_voice)
+        )
+
+    async def _synthesize(self, payload: Dict, selected_voice: str) -> Dict:
+        # Long texts take a while to synthesize and each call is billed, so
+        # a slow response is waited out rather than retried
+        response = await retry_post(
+            get_http_client(), self._tts_url, timeouts=(30.0, 30.0),
+            retry_timeouts=False, content=orjson.dumps(payload), headers=JSON_HEADERS,
+        )
+
+        if response.status_code != 200:
+            error = response.text
+            logger.error("Gemini TTS error %s: %s", response.status_code, error)
+            raise Exception(f"TTS API error: {response.status_code}")
+
+        data = orjson.loads(response.content)
+
+        # Extract audio
+        if "candidates" in data and data["candidates"]:
+            candidate = data["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                for part in candidate["content"]["parts"]:
+                    if "inlineData" in part:
+                        logger.info("TTS Success: voice=%s", selected_voice)
+                        return {
+                            "audio": part["inlineData"]["data"],
+                            "mimeType": part["inlineData"].get("mimeType", "audio/L16;rate=24000"),
+                            "voice": selected_voice,
+                            "provider": "gemini-2.5-flash-tts"
+                        }
+
+        raise Exception("No audio in response")
+
+    async def text_to_speech_audio(
+        self,
+        text: str,
+        voice: str = "Puck",
+        style: Optional[str] = None,
+        auto_emotion: bool = True,
+        skip_normalize: bool = False,
+    ) -> Tuple[bytes, str]:
+        """Like text_to_speech, but return (raw audio bytes, mime type).
+
+        For binary responses: the base64 string from Gemini is decoded once
+        instead of being shipped to the client 4/3 larger.
+        """
+        result = await self.text_to_speech(text, voice, style, auto_emotion, skip_normalize)
+        return base64.b64decode(result["audio"]), result["mimeType"]
+
+    def _build_tts_payload(
+        self,
+        text: str,
+        voice: str,
+        style: Optional[str],
+        auto_emotion: bool,
+        skip_normalize: bool = False,
+    ) -> Tuple[str, Dict]:
+        """Validate and normalize TTS input; return (voice, request payload)."""
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not configured")
 
         text = (text or "").strip()
         if not text:
             raise ValueError("Text is required")
+        text = _cap_text(text, "TTS text")
 
         # IMPORTANT: Normalize text for TTS
-        text = self.normalizer.normalize_for_tts(text)
+        if not skip_normalize:
+            text = self.normalizer.normalize_for_tts(text)
 
         # Detect emotion if auto_emotion enabled and no style specified
         detected_emotion = "neutral"
@@ -335,10 +690,10 @@ class GeminiVoiceService:
             style = auto_style
 
         # Log for debugging
-        logger.info(f"TTS: emotion={detected_emotion}, text={text[:50]}...")
+        logger.info("TTS: emotion=%s, text=%.50s...", detected_emotion, text)
 
         # Validate voice
-        selected_voice = voice if voice in self.ALL_VOICES else "Puck"
+        selected_voice = voice if voice in self.VOICE_SET else "Puck"
 
         # Build prompt with style
         if style:
@@ -346,49 +701,44 @@ class GeminiVoiceService:
         else:
             prompt_text = text
 
-        url = f"{self.base_url}/models/{self.TTS_MODEL}:generateContent?key={self.api_key}"
-
         payload = {
             "contents": [{
                 "parts": [{"text": prompt_text}]
             }],
-            "generationConfig": {
-                "responseModalities": ["AUDIO"],
-                "speechConfig": {
-                    "voiceConfig": {
-                        "prebuiltVoiceConfig": {
-                            "voiceName": selected_voice
-                        }
-                    }
-                }
-            }
+            # Only the text varies per request; the config is built once per voice
+            "generationConfig": _generation_config(selected_voice),
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload)
+        return selected_voice, payload
 
-            if response.status_code != 200:
-                error = response.text
-                logger.error(f"Gemini TTS error {response.status_code}: {error}")
-                raise Exception(f"TTS API error: {response.status_code}")
+    def text_to_speech_stream(
+        self,
+        text: str,
+        voice: str = "Puck",
+        style: Optional[str] = None,
+        auto_emotion: bool = True,
+    ) -> AsyncIterator[bytes]:
+        """Stream raw 24 kHz 16-bit PCM as Gemini generates it.
 
-            data = response.json()
+        Same input handling as text_to_speech, but audio chunks are yielded
+        as they arrive so playback can start before synthesis finishes.
+        Input errors raise here, before any audio is produced.
+        """
+        _, payload = self._build_tts_payload(text, voice, style, auto_emotion)
+        return self._stream_audio(payload)
 
-            # Extract audio
-            if "candidates" in data and data["candidates"]:
-                candidate = data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    for part in candidate["content"]["parts"]:
-                        if "inlineData" in part:
-                            logger.info(f"TTS Success: voice={selected_voice}")
-                            return {
-                                "audio": part["inlineData"]["data"],
-                                "mimeType": part["inlineData"].get("mimeType", "audio/L16;rate=24000"),
-                                "voice": selected_voice,
-                                "provider": "gemini-2.5-flash-tts"
-                            }
+    async def _stream_audio(self, payload: Dict) -> AsyncIterator[bytes]:
+        async with get_http_client().stream(
+            "POST", self._tts_stream_url, content=orjson.dumps(payload), headers=JSON_HEADERS, timeout=30.0
+        ) as response:
+            if response.status_code != 200:
+                error = (await response.aread()).decode(errors="replace")
+                logger.error("Gemini TTS stream error %s: %s", response.status_code, error)
+                raise Exception(f"TTS API error: {response.status_code}")
 
-            raise Exception("No audio in response")
+            async for part in _iter_sse_parts(response):
+                if "inlineData" in part:
+                    yield base64.b64decode(part["inlineData"]["data"])
 
     async def generate_voice_response(
         self,
@@ -422,31 +772,20 @@ class GeminiVoiceService:
             raise ValueError("GOOGLE_API_KEY not configured")
 
         # LOG: Raw STT input
-        logger.info(f"[STT→LLM] Input: {user_message}, Confidence: {stt_confidence}")
-
-        # GUARDRAIL 1: Check STT confidence
-        if stt_confidence < 0.7:
-            clarification = "I'm not sure I heard you correctly. Could you please repeat that?"
-            tts_result = await self.text_to_speech(clarification, voice, "apologetically")
-            return {
-                "response": clarification,
-                "audio": tts_result["audio"],
-                "mimeType": tts_result["mimeType"],
-                "voice": voice,
-                "needs_clarification": True
-            }
-
-        # GUARDRAIL 2: Check for emergency keywords
-        emergency_response = self.normalizer.normalize_for_emergency(user_message)
-        if emergency_response:
-            logger.warning(f"[EMERGENCY] Triggered by: {user_message}")
-            tts_result = await self.text_to_speech(emergency_response, voice, "seriously and clearly")
+        user_message = _cap_text(user_message, "user_message")
+        logger.info("[STT→LLM] Input: %s, Confidence: %s", user_message, stt_confidence)
+
+        # GUARDRAILS: low STT confidence or emergency keywords
+        guardrail = self._guardrail_reply(user_message, stt_confidence)
+        if guardrail:
+            reply, style, flag = guardrail
+            tts_result = await self._speak_fixed(reply, voice, style)
             return {
-                "response": emergency_response,
+                "response": reply,
                 "audio": tts_result["audio"],
                 "mimeType": tts_result["mimeType"],
                 "voice": voice,
-                "is_emergency": True
+                flag: True
             }
 
         # Step 1: Generate text response using LLM
@@ -455,7 +794,7 @@ class GeminiVoiceService:
                 user_message, conversation_history, language
             )
         except Exception as e:
-            logger.error(f"[LLM] Failed: {e}")
+            logger.error("[LLM] Failed: %s", e)
             fallback = "I'm having trouble processing that. Let me try again."
             tts_result = await self.text_to_speech(fallback, voice)
             return {
@@ -467,20 +806,21 @@ class GeminiVoiceService:
             }
 
         # LOG: LLM output
-        logger.info(f"[LLM→TTS] Output: {text_response[:100]}...")
+        logger.info("[LLM→TTS] Output: %.100s...", text_response)
 
-        # Step 2: Normalize for TTS
-        normalized_response = self.normalizer.normalize_for_tts(text_response)
+        # Step 2: Normalize for TTS (long replies off the event loop)
+        normalized_response = await self._normalize_reply(text_response)
 
         # Step 3: Convert to speech
         try:
             tts_result = await self.text_to_speech(
                 normalized_response,
                 voice=voice,
-                style="naturally and conversationally"
+                style="naturally and conversationally",
+                skip_normalize=True,
             )
         except Exception as e:
-            logger.error(f"[TTS] Failed: {e}")
+            logger.error("[TTS] Failed: %s", e)
             # Return text response without audio
             return {
                 "response": text_response,
@@ -501,78 +841,154 @@ class GeminiVoiceService:
             "provider": "gemini-native"
         }
 
-    async def _generate_voice_optimized_response(
+    async def _normalize_reply(self, text: str) -> str:
+        """Normalize an LLM reply on the loop when cheap, in a thread otherwise.
+
+        Short texts are cached or take microseconds, so a thread hop would
+        cost more than the work; long replies are scanned by every pass.
+        """
+        if len(text) <= _TEXT_CACHE_MAX_LEN:
+            return self.normalizer.normalize_llm_output(text)
+        return await run_in_threadpool(self.normalizer.normalize_llm_output, text)
+
+    def _guardrail_reply(
+        self, user_message: str, stt_confidence: float
+    ) -> Optional[Tuple[str, str, str]]:
+        """Fixed (reply, style, flag) when the LLM must be skipped, else None."""
+        # GUARDRAIL 1: Check STT confidence
+        if stt_confidence < 0.7:
+            return (
+                "I'm not sure I heard you correctly. Could you please repeat that?",
+                "apologetically",
+                "needs_clarification",
+            )
+
+        # GUARDRAIL 2: Check for emergency keywords
+        emergency_response = self.normalizer.normalize_for_emergency(user_message)
+        if emergency_response:
+            logger.warning("[EMERGENCY] Triggered by: %s", user_message)
+            return emergency_response, "seriously and clearly", "is_emergency"
+
+        return None
+
+    async def _speak_fixed(self, text: str, voice: str, style: str) -> Dict:
+        """text_to_speech for the fixed guardrail scripts, memoized.
+
+        The scripts are a handful of constant strings, so their audio is
+        kept in process (bounded by scripts x voices) and repeat triggers
+        skip the TTS round-trip.
+        """
+        # Key on the validated voice so arbitrary names can't grow the dict
+        key = (text, voice if voice in self.VOICE_SET else "Puck", style)
+        result = self._fixed_audio.get(key)
+        if result is None:
+            result = await self.text_to_speech(text, voice, style)
+            self._fixed_audio[key] = result
+        return result
+
+    async def _fixed_audio_stream(self, text: str, voice: str, style: str) -> AsyncIterator[bytes]:
+        result = await self._speak_fixed(text, voice, style)
+        yield base64.b64decode(result["audio"])
+
+    def generate_voice_response_stream(
         self,
         user_message: str,
         conversation_history: List[Dict] = None,
+        voice: str = "Puck",
         language: str = "en-US",
-        detected_input_lang: str = None,
-    ) -> str:
-        """Generate voice-optimized response using Gemini 2.5 Flash.
+        stt_confidence: float = 1.0,
+    ) -> AsyncIterator[bytes]:
+        """Voice pipeline that streams raw 24 kHz 16-bit PCM.
 
-        December 2025 Improvements:
-        ━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        ✓ 90% instruction adherence (up from 84%)
-        ✓ Better multi-turn context retrieval
-        ✓ Smoother conversation flow
-        ✓ Auto language detection support
+        The LLM reply is streamed and cut at sentence boundaries, and each
+        piece is synthesized as soon as it is complete, so the first
+        sentence is being voiced while the model is still writing the rest.
+        Input errors raise here, before any audio is produced.
         """
+        if not self.api_key:
+            raise ValueError("GOOGLE_API_KEY not configured")
 
-        # Enhanced system prompt for robust instruction following
-        system_prompt = f"""You are AssistMe, a professional AI voice assistant.
+        user_message = _cap_text(user_message, "user_message")
+        logger.info("[STT→LLM] Input: %s, Confidence: %s", user_message, stt_confidence)
 
-═══════════════════════════════════════════════════════════════
-VOICE OUTPUT REQUIREMENTS (STRICTLY FOLLOW - 90% adherence expected)
-═══════════════════════════════════════════════════════════════
+        guardrail = self._guardrail_reply(user_message, stt_confidence)
+        if guardrail:
+            reply, style, _ = guardrail
+            return self._fixed_audio_stream(reply, voice, style)
 
-RESPONSE FORMAT:
-• Keep responses to 2-3 sentences MAXIMUM
-• Never exceed 50 words total
-• End with a clear, complete thought
+        payload = self._build_voice_llm_payload(user_message, conversation_history, language)
+        return self._speak_reply_stream(payload, voice)
 
-FORBIDDEN (NEVER USE):
-✗ Markdown (no **, ##, ```, etc.)
-✗ Lists, bullet points, or numbered items
-✗ Emojis or special characters
-✗ Code blocks or technical formatting
-✗ Multiple paragraphs
-
-SPEECH OPTIMIZATION:
-• Spell out numbers (say "twenty-five" not "25")
-• Use commas for natural pauses
-• Use periods for longer pauses
-• Vary sentence length for rhythm
-• End statements confidently
+    async def _speak_reply_stream(self, payload: Dict, voice: str) -> AsyncIterator[bytes]:
+        pending: Deque[asyncio.Task] = deque()
 
-LANGUAGE: {language}
-{f"(User spoke in: {detected_input_lang})" if detected_input_lang else ""}
+        def speak(text: str) -> None:
+            pending.append(asyncio.create_task(self._synthesize_pcm(text, voice)))
 
-PERSONALITY:
-• Warm and friendly but professional
-• Concise and helpful
-• Sound natural when spoken aloud
-• Never apologize excessively
-
-Remember: Your response will be spoken aloud by Gemini TTS."""
+        try:
+            buffer = ""
+            min_chars = _FIRST_CHUNK_MIN_CHARS
+            async for delta in self._stream_voice_optimized_response(payload):
+                buffer += delta
+                while (match := _SENTENCE_END_RE.search(buffer, min_chars)):
+                    speak(buffer[:match.end()])
+                    buffer = buffer[match.end():]
+                    min_chars = _NEXT_CHUNK_MIN_CHARS
+                # Hand over finished audio without waiting for the model
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+            if buffer.strip():
+                speak(buffer)
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _synthesize_pcm(self, text: str, voice: str) -> bytes:
+        audio, _ = await self.text_to_speech_audio(
+            self.normalizer.normalize_llm_output(text),
+            voice,
+            style="naturally and conversationally",
+            skip_normalize=True,
+        )
+        return audio
+
+    def _build_voice_llm_payload(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict]],
+        language: str,
+        detected_input_lang: Optional[str] = None,
+    ) -> Dict:
+        """Gemini request body for a voice-optimized reply."""
+        # Enhanced system prompt for robust instruction following
+        system_prompt = _voice_system_prompt(language, detected_input_lang)
 
         messages = [{"role": "user", "parts": [{"text": system_prompt}]}]
 
         # Enhanced context retrieval (Dec 2025 improvement)
-        # Use last 8 turns for better conversation coherence
+        # Use last 8 turns for better conversation coherence, newest first
+        # until MAX_HISTORY_CHARS so a few huge turns can't bloat the prompt
         if conversation_history:
-            for msg in conversation_history[-8:]:
+            turns = []
+            budget = MAX_HISTORY_CHARS
+            for msg in reversed(conversation_history[-8:]):
+                content = msg.get("content", "")
+                budget -= len(content)
+                if budget < 0:
+                    break
                 role = "user" if msg.get("role") == "user" else "model"
-                messages.append({
+                turns.append({
                     "role": role,
-                    "parts": [{"text": msg.get("content", "")}]
+                    "parts": [{"text": content}]
                 })
+            messages.extend(reversed(turns))
 
         # Add current message
         messages.append({"role": "user", "parts": [{"text": user_message}]})
 
-        url = f"{self.base_url}/models/{self.LLM_MODEL}:generateContent?key={self.api_key}"
-
-        payload = {
+        return {
             "contents": messages,
             "generationConfig": {
                 "temperature": 0.7,
@@ -582,49 +998,74 @@ Remember: Your response will be spoken aloud by Gemini TTS."""
             }
         }
 
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            response = await client.post(url, json=payload)
+    async def _generate_voice_optimized_response(
+        self,
+        user_message: str,
+        conversation_history: List[Dict] = None,
+        language: str = "en-US",
+        detected_input_lang: str = None,
+    ) -> str:
+        """Generate voice-optimized response using Gemini 2.5 Flash.
+
+        December 2025 Improvements:
+        ━━━━━━━━━━━━━━━━━━━━━━━━━━━
+        ✓ 90% instruction adherence (up from 84%)
+        ✓ Better multi-turn context retrieval
+        ✓ Smoother conversation flow
+        ✓ Auto language detection support
+        """
 
+        payload = self._build_voice_llm_payload(
+            user_message, conversation_history, language, detected_input_lang
+        )
+
+        response = await get_http_client().post(
+            self._llm_url, content=orjson.dumps(payload), headers=JSON_HEADERS, timeout=20.0
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"LLM API error: {response.status_code}")
+
+        data = orjson.loads(response.content)
+
+        if "candidates" in data and data["candidates"]:
+            return data["candidates"][0]["content"]["parts"][0]["text"]
+
+        raise Exception("No response generated")
+
+    async def _stream_voice_optimized_response(self, payload: Dict) -> AsyncIterator[str]:
+        """Yield reply text as Gemini generates it."""
+        generated = False
+        async with get_http_client().stream(
+            "POST", self._llm_stream_url, content=orjson.dumps(payload), headers=JSON_HEADERS, timeout=20.0
+        ) as response:
             if response.status_code != 200:
                 raise Exception(f"LLM API error: {response.status_code}")
 
-            data = response.json()
-
-            if "candidates" in data and data["candidates"]:
-                return data["candidates"][0]["content"]["parts"][0]["text"]
+            async for part in _iter_sse_parts(response):
+                text = part.get("text")
+                if text:
+                    generated = True
+                    yield text
 
+        if not generated:
             raise Exception("No response generated")
 
-    def get_voices(self) -> Dict:
-        """Get available voices grouped by style."""
-        return {
-            "grouped": self.VOICES,
-            "all": self.ALL_VOICES,
-            "count": len(self.ALL_VOICES)
-        }
+    def get_voices(self) -> Mapping:
+        """Get available voices grouped by style (read-only)."""
+        return self.VOICES_INFO
 
-    def get_languages(self) -> Dict:
-        """Get supported languages with full metadata."""
-        return {
-            "languages": self.LANGUAGES,
-            "indian": {
-                code: self.LANGUAGES[code]
-                for code in self.INDIAN_LANGUAGES
-            },
-            "codes": list(self.LANGUAGES.keys()),
-            "count": len(self.LANGUAGES)
-        }
+    def get_languages(self) -> Mapping:
+        """Get supported languages with full metadata (read-only)."""
+        return self.LANGUAGES_INFO
 
-    def get_indian_languages(self) -> Dict:
-        """Get Indian languages specifically supported by Gemini TTS."""
-        return {
-            code: self.LANGUAGES[code]
-            for code in self.INDIAN_LANGUAGES
-        }
+    def get_indian_languages(self) -> Mapping:
+        """Get Indian languages specifically supported by Gemini TTS (read-only)."""
+        return self.INDIAN_LANGUAGES_INFO
 
     def is_indian_language(self, lang_code: str) -> bool:
         """Check if a language code is an Indian language."""
-        return lang_code in self.INDIAN_LANGUAGES
+        return lang_code in self.INDIAN_LANGUAGE_SET
 
 
 # Singleton
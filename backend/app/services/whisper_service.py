@@ -1,8 +1,8 @@
 """Whisper speech-to-text service."""
 
+import asyncio
 import logging
 import os
-import tempfile
 from typing import Any, Dict, Optional
 
 try:
@@ -10,46 +10,50 @@ try:
 except ImportError:
     whisper = None
     logging.getLogger(__name__).warning("openai-whisper not installed. Speech-to-text features will be unavailable.")
-from starlette.concurrency import run_in_threadpool
+
+from .whisper_worker import WhisperWorker
 
 logger = logging.getLogger(__name__)
 
 
 class WhisperService:
-    """Service for speech-to-text using Whisper."""
+    """Service for speech-to-text using Whisper.
+
+    Inference runs in a single shared worker process (see ``whisper_worker``)
+    so transcriptions never hold the event loop's GIL; at most
+    ``max_concurrency`` jobs are queued on it at once.
+    """
 
-    def __init__(self, model_size: str = "base"):
+    def __init__(
+        self,
+        model_size: str = "base",
+        max_concurrency: int = 4,
+        batch_transcribe: bool = False,
+    ):
         """Initialize Whisper with specified model size.
 
         Args:
             model_size: tiny, base, small, medium, large
+            max_concurrency: Jobs allowed in the worker queue at once
+            batch_transcribe: Decode concurrent short transcriptions together
         """
         self.model_size = model_size
-        self.model = None
-        self._is_loading = False
+        self._worker = WhisperWorker(
+            model_size, max_batch=max_concurrency, batch_transcribe=batch_transcribe
+        )
+        self._slots = asyncio.Semaphore(max_concurrency)
 
-    def _load_model(self):
-        """Load the model if not already loaded."""
-        if self.model:
-            return
+    def close(self) -> None:
+        """Stop the worker process, letting queued jobs finish first."""
+        self._worker.close()
 
+    async def _run(self, kind: str, audio: bytes, **options: Any) -> Any:
+        """Submit a job to the worker process and await its result."""
         if whisper is None:
             raise RuntimeError("openai-whisper library is not installed. Please install it to use speech-to-text.")
 
-        if self._is_loading:
-            logger.warning("Whisper model is already loading...")
-            return
-
-        try:
-            self._is_loading = True
-            logger.info(f"Loading Whisper model: {self.model_size}...")
-            self.model = whisper.load_model(self.model_size)
-            logger.info("Whisper model loaded successfully.")
-        except Exception as e:
-            logger.error(f"Failed to load Whisper model: {e}")
-            raise
-        finally:
-            self._is_loading = False
+        async with self._slots:
+            return await asyncio.wrap_future(self._worker.submit(kind, audio, **options))
 
     async def transcribe(
         self,
@@ -65,38 +69,35 @@ class WhisperService:
         Returns:
             dict with 'text', 'language', 'segments'
         """
-        if not self.model:
-            await run_in_threadpool(self._load_model)
+        try:
+            return await self._run("transcribe", audio_file, language=language)
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            raise
 
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp.write(audio_file)
-            tmp_path = tmp.name
+    async def transcribe_pcm(
+        self,
+        pcm: bytes,
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Transcribe raw 16 kHz mono s16le PCM without a temp file.
+
+        Args:
+            pcm: Raw little-endian 16-bit PCM samples at 16 kHz
+            language: Optional language code (e.g., 'en', 'hi')
+            initial_prompt: Optional text already spoken, used as context
 
+        Returns:
+            dict with 'text', 'language', 'segments'
+        """
         try:
-            # Run blocking transcribe in threadpool
-            def _do_transcribe():
-                return self.model.transcribe(
-                    tmp_path,
-                    language=language,
-                    task="transcribe",
-                    fp16=False,  # Disable FP16 on CPU to avoid warnings/errors
-                )
-
-            result = await run_in_threadpool(_do_transcribe)
-
-            return {
-                "text": result["text"].strip(),
-                "language": result["language"],
-                "segments": result["segments"],
-            }
+            return await self._run(
+                "pcm", pcm, language=language, initial_prompt=initial_prompt
+            )
         except Exception as e:
             logger.error(f"Transcription error: {e}")
             raise
-        finally:
-            # Cleanup
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
 
     async def detect_language(self, audio_file: bytes) -> str:
         """Detect language from audio.
@@ -107,38 +108,17 @@ class WhisperService:
         Returns:
             Language code (e.g., 'en', 'hi')
         """
-        if not self.model:
-            await run_in_threadpool(self._load_model)
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp.write(audio_file)
-            tmp_path = tmp.name
-
         try:
-
-            def _do_detect():
-                # Load audio and detect language
-                import torch
-                # Get device from model if available, otherwise use CPU
-                device = self.model.device if hasattr(self.model, 'device') else 'cpu'
-                if isinstance(device, str) and device == 'cpu':
-                    device = torch.device('cpu')
-
-                audio = whisper.load_audio(tmp_path)
-                audio = whisper.pad_or_trim(audio)
-                mel = whisper.log_mel_spectrogram(audio).to(device)
-                _, probs = self.model.detect_language(mel)
-                return max(probs, key=probs.get)
-
-            return await run_in_threadpool(_do_detect)
+            return await self._run("detect", audio_file)
         except Exception as e:
             logger.error(f"Language detection error: {e}")
             raise
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
 
 
 # Global instance
 # We don't initialize it here to avoid loading model on import
-whisper_service = WhisperService(model_size=os.getenv("WHISPER_MODEL_SIZE", "base"))
+whisper_service = WhisperService(
+    model_size=os.getenv("WHISPER_MODEL_SIZE", "base"),
+    max_concurrency=int(os.getenv("WHISPER_MAX_CONCURRENCY", "4")),
+    batch_transcribe=os.getenv("WHISPER_BATCH_TRANSCRIBE", "false").lower() == "true",
+)
@@ -0,0 +1,343 @@
+"""Dedicated Whisper inference process.
+
+Whisper inference is GIL-bound, so running it inside the API process lets
+one long transcription stall every other request. The model is instead
+loaded once in a child process and all routes submit jobs to it over a
+queue.
+
+Language detection jobs that arrive together are batched into one forward
+pass; detection only looks at the first 30 s window, so the result is the
+same as running each clip alone. Batched transcription is opt-in
+(``batch_transcribe``): it decodes each clip of up to 30 s as one padded
+window, so segments are coarse. Clips whose decode fails Whisper's
+quality thresholds are rerun through ``model.transcribe`` with its usual
+temperature fallback.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_WINDOW_SEC = 0.02  # How long to wait for more jobs to join a batch
+SAMPLE_RATE = 16000
+MAX_BATCH_SAMPLES = 30 * SAMPLE_RATE  # One Whisper window; longer clips run alone
+COMPRESSION_RATIO_THRESHOLD = 2.4  # model.transcribe defaults for falling back
+LOGPROB_THRESHOLD = -1.0
+
+
+def _load_samples(kind: str, audio: bytes):
+    """Decode job audio to 16 kHz float32 samples (worker process side)."""
+    import numpy as np
+    import whisper
+
+    if kind == "pcm":
+        return np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
+        tmp.write(audio)
+        tmp_path = tmp.name
+    try:
+        return whisper.load_audio(tmp_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _mel_batch(model, clips: List):
+    import torch
+    import whisper
+
+    mels = [
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(samples), model.dims.n_mels)
+        for samples in clips
+    ]
+    return torch.stack(mels).to(model.device)
+
+
+def _run_job(model, kind: str, samples, options: Dict[str, Any]) -> Any:
+    """Run one job against the loaded model (worker process side)."""
+    if kind == "detect":
+        _, probs = model.detect_language(_mel_batch(model, [samples])[0])
+        return max(probs, key=probs.get)
+
+    result = model.transcribe(
+        samples,
+        task="transcribe",
+        fp16=False,  # Disable FP16 on CPU to avoid warnings/errors
+        **options,
+    )
+    return {
+        "text": result["text"].strip(),
+        "language": result["language"],
+        "segments": result["segments"],
+    }
+
+
+def _run_batched(model, kind: str, language: Optional[str], clips: List) -> List:
+    """Run same-kind jobs of at most 30 s through one padded forward pass."""
+    import whisper
+
+    mel = _mel_batch(model, clips)
+    if kind == "detect":
+        _, probs = model.detect_language(mel)
+        return [max(p, key=p.get) for p in probs]
+
+    options = whisper.DecodingOptions(task="transcribe", language=language, fp16=False)
+    values = []
+    for decoded, samples in zip(whisper.decode(model, mel, options), clips):
+        if (
+            decoded.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+            or decoded.avg_logprob < LOGPROB_THRESHOLD
+        ):
+            # Same path an unbatched job takes, temperature fallback included
+            values.append(_run_job(model, kind, samples, {"language": language}))
+            continue
+        values.append({
+            "text": decoded.text.strip(),
+            "language": decoded.language,
+            "segments": [
+                {
+                    "id": 0,
+                    "start": 0.0,
+                    "end": len(samples) / SAMPLE_RATE,
+                    "text": decoded.text,
+                }
+            ],
+        })
+    return values
+
+
+def _next_batch(jobs, max_batch: int) -> Tuple[List, bool]:
+    """Block for one job, then collect more for up to BATCH_WINDOW_SEC.
+
+    Returns the batch and whether the shutdown sentinel was seen.
+    """
+    first = jobs.get()
+    if first is None:
+        return [], True
+
+    batch = [first]
+    deadline = time.monotonic() + BATCH_WINDOW_SEC
+    while len(batch) < max_batch:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            job = jobs.get(timeout=timeout)
+        except queue.Empty:
+            break
+        if job is None:
+            return batch, True
+        batch.append(job)
+    return batch, False
+
+
+def _run_batch(
+    model, batch: List, batch_transcribe: bool
+) -> List[Tuple[int, Any, Optional[str]]]:
+    """Process a batch of jobs and return ``(job_id, value, error)`` results."""
+    results = []
+    groups: Dict[Tuple[str, Optional[str]], List] = {}
+    for job_id, kind, audio, options in batch:
+        try:
+            samples = _load_samples(kind, audio)
+        except Exception as e:
+            results.append((job_id, None, str(e)))
+            continue
+
+        # Streaming PCM jobs need real segment timestamps, so they always
+        # go through model.transcribe rather than a single padded decode.
+        batchable = (
+            len(batch) > 1
+            and (kind == "detect" or (kind == "transcribe" and batch_transcribe))
+            and set(options) <= {"language"}
+            and len(samples) <= MAX_BATCH_SAMPLES
+        )
+        if batchable:
+            key = (kind, options.get("language"))
+            groups.setdefault(key, []).append((job_id, samples, options))
+            continue
+
+        try:
+            results.append((job_id, _run_job(model, kind, samples, options), None))
+        except Exception as e:
+            results.append((job_id, None, str(e)))
+
+    for (kind, language), jobs in groups.items():
+        try:
+            if len(jobs) == 1:
+                job_id, samples, options = jobs[0]
+                values = [_run_job(model, kind, samples, options)]
+            else:
+                values = _run_batched(model, kind, language, [s for _, s, _ in jobs])
+        except Exception as e:
+            results.extend((job_id, None, str(e)) for job_id, _, _ in jobs)
+            continue
+        results.extend(
+            (job_id, value, None) for (job_id, _, _), value in zip(jobs, values)
+        )
+
+    return results
+
+
+def _serve(model_size: str, jobs, results, max_batch: int, batch_transcribe: bool) -> None:
+    """Worker process entry point: load the model once, then serve jobs."""
+    try:
+        import whisper
+
+        model = whisper.load_model(model_size)
+    except Exception as e:
+        results.put((None, None, f"Failed to load Whisper model: {e}"))
+        return
+
+    while True:
+        batch, stop = _next_batch(jobs, max_batch)
+        for result in _run_batch(model, batch, batch_transcribe):
+            results.put(result)
+        if stop:
+            return
+
+
+class WhisperWorker:
+    """Client side of the single shared Whisper worker process."""
+
+    def __init__(self, model_size: str, max_batch: int = 4, batch_transcribe: bool = False):
+        """
+        Args:
+            model_size: Whisper model to load in the worker
+            max_batch: Most jobs decoded together; match the caller's concurrency cap
+            batch_transcribe: Also batch short transcriptions (coarse segments)
+        """
+        self.model_size = model_size
+        self.max_batch = max_batch
+        self.batch_transcribe = batch_transcribe
+        self._process = None
+        self._jobs = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, audio: bytes, **options: Any) -> Future:
+        """Queue a job; the returned future resolves with the worker result.
+
+        Args:
+            kind: 'transcribe' (encoded audio file), 'pcm' (16 kHz s16le) or 'detect'
+            audio: Audio bytes
+            options: Extra keyword arguments for ``model.transcribe``
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._process is None or not self._process.is_alive():
+                self._start()
+            job_id = next(self._ids)
+            self._pending[job_id] = future
+            jobs = self._jobs
+
+        jobs.put((job_id, kind, audio, options))
+        return future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Ask the worker to finish queued jobs and exit."""
+        with self._lock:
+            process, jobs = self._process, self._jobs
+        if process is None or not process.is_alive():
+            return
+        jobs.put(None)
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+
+    def _start(self) -> None:
+        # torch is not fork-safe, so always spawn a fresh interpreter
+        ctx = multiprocessing.get_context("spawn")
+        self._jobs = ctx.Queue()
+        self._pending = {}
+        results = ctx.Queue()
+        self._process = ctx.Process(
+            target=_serve,
+            args=(
+                self.model_size,
+                self._jobs,
+                results,
+                self.max_batch,
+                self.batch_transcribe,
+            ),
+            name="whisper-worker",
+            daemon=True,
+        )
+        self._process.start()
+        threading.Thread(
+            target=self._collect,
+            args=(self._process, results, self._pending),
+            name="whisper-results",
+            daemon=True,
+        ).start()
+        logger.info(f"Started Whisper worker process (model: {self.model_size})")
+
+    def _collect(self, process, results, pending: Dict[int, Future]) -> None:
+        """Resolve pending futures as results arrive from the worker.
+
+        Whenever this thread stops, the worker is torn down and every
+        pending job fails, so the next ``submit`` starts a fresh process.
+        """
+        error = "Whisper worker exited unexpectedly"
+        try:
+            while True:
+                try:
+                    job_id, value, job_error = results.get(timeout=1.0)
+                except queue.Empty:
+                    if process.is_alive():
+                        continue
+                    return
+
+                if job_id is None:
+                    error = job_error
+                    logger.error(error)
+                    return
+
+                with self._lock:
+                    future = pending.pop(job_id, None)
+                # A caller that stopped waiting cancels its future
+                if future is None or future.done():
+                    continue
+                try:
+                    if job_error:
+                        future.set_exception(RuntimeError(job_error))
+                    else:
+                        future.set_result(value)
+                except InvalidStateError:
+                    pass  # Cancelled between the check and the set
+        except Exception as e:
+            error = f"Whisper result collector failed: {e}"
+            logger.exception(error)
+        finally:
+            self._mark_dead(process)
+            self._fail_pending(pending, error)
+
+    def _mark_dead(self, process) -> None:
+        with self._lock:
+            if self._process is process:
+                self._process = None
+        if process.is_alive():
+            process.terminate()
+
+    def _fail_pending(self, pending: Dict[int, Future], error: str) -> None:
+        with self._lock:
+            futures = list(pending.values())
+            pending.clear()
+        for future in futures:
+            if not future.done():
+                try:
+                    future.set_exception(RuntimeError(error))
+                except InvalidStateError:
+                    pass